@@ -0,0 +1,57 @@
+import time
+from typing import Callable
+
+from src.core.encoder import HexagonalEncoder
+from src.core.drawing import render_cells, render_cells_antialiased
+from src.core.scaled_render import ScaledRenderer
+
+
+def measure(render: Callable[[], object], repeat: int = 5) -> float:
+    """Retourne le temps moyen d'un rendu, en millisecondes."""
+    render()  # Échauffement
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def benchmark_antialiasing(hex_sizes: tuple[float, ...] = (6.0, 12.0, 24.0), factors: tuple[int, ...] = (2, 4, 8),
+                           band_height: int = 16) -> None:
+    """Compare le rendu crénelé (Pillow `polygon`) au rendu anticrénelé par bandes.
+
+    La colonne "bande Mo" donne la mémoire de travail du rendu anticrénelé (une bande
+    suréchantillonnée), à comparer à "canevas Mo", celle d'un canevas entier k² fois plus grand.
+    """
+    print(f"{'hex_size':>8} {'image':>11} {'mode':>15} {'ms':>8} {'bande Mo':>9} {'canevas Mo':>11}")
+    for hex_size in hex_sizes:
+        encoder = HexagonalEncoder(hex_size=hex_size)
+        cells = encoder.encode_cells("Benchmark de rendu")
+        width, height = encoder.image_size
+        elapsed = measure(lambda: render_cells(encoder.layout, cells, encoder.image_size))
+        print(f"{hex_size:>8g} {f'{width}x{height}':>11} {'crénelé':>15} {elapsed:>8.1f}")
+        for k in factors:
+            elapsed = measure(lambda: render_cells_antialiased(encoder.layout, cells, encoder.image_size,
+                                                               supersample=k, band_height=band_height))
+            strip_mb = width * k * band_height * k * 3 / 1e6
+            canvas_mb = width * k * height * k * 3 / 1e6
+            print(f"{hex_size:>8g} {f'{width}x{height}':>11} {f'anticrénelé x{k}':>15} {elapsed:>8.1f} "
+                  f"{strip_mb:>9.2f} {canvas_mb:>11.1f}")
+
+
+def benchmark_scaled(base_hex_size: float = 6.0, scales: tuple[int, ...] = (1, 2, 4, 8)) -> None:
+    """Compare un rendu complet à chaque taille au rendu canonique répliqué (`ScaledRenderer`)."""
+    renderer = ScaledRenderer(hex_size=base_hex_size)
+    cells = HexagonalEncoder().encode_cells("Benchmark de rendu")
+    print(f"{'échelle':>8} {'image':>11} {'complet ms':>11} {'répliqué ms':>12}")
+    for scale in scales:
+        encoder = HexagonalEncoder(hex_size=base_hex_size * scale)
+        full = measure(lambda: render_cells(encoder.layout, cells, encoder.image_size))
+        scaled = measure(lambda: renderer.render(cells, scale))
+        width, height = renderer.image_size
+        print(f"{scale:>8} {f'{width * scale}x{height * scale}':>11} {full:>11.1f} {scaled:>12.1f}")
+
+
+if __name__ == '__main__':
+    benchmark_antialiasing()
+    print()
+    benchmark_scaled()
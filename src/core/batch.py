@@ -0,0 +1,107 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+import multiprocessing
+import os
+
+from PIL import Image
+
+# Imports relatifs car batch.py est dans core/
+from .encoder import HexagonalEncoder
+
+# Paramètres (version, ecc_level, hex_size, quiet_zone) identifiant un encodeur
+EncoderParams = tuple[str, str, float, float]
+
+# Encodeur du processus courant, construit par le parent (voir `fork_context`) :
+# les workers héritent de ses tables précalculées (layout, rôles, structure).
+_worker_encoder: HexagonalEncoder | None = None
+_worker_params: EncoderParams | None = None
+
+
+def fork_context() -> multiprocessing.context.BaseContext:
+    """Le contexte de démarrage des pools de workers : "fork" lorsque la plateforme le permet.
+
+    Avec "fork", les workers héritent des objets construits par le parent avant
+    la création du pool (encodeur, décodeur et leurs tables précalculées) sans
+    rien recalculer ; ailleurs, le contexte par défaut est utilisé.
+    """
+    return multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+
+
+def _init_worker(params: EncoderParams) -> None:
+    """Initialise l'encodeur d'un worker, une seule fois par processus."""
+    global _worker_encoder, _worker_params
+    if _worker_params != params:
+        # Démarrage "spawn" : rien n'a été hérité du parent
+        _worker_encoder = HexagonalEncoder(*params)
+        _worker_params = params
+
+
+def _encode_chunk(messages: list[str]) -> list[Image.Image]:
+    """Encode un lot de messages avec l'encodeur du worker."""
+    assert _worker_encoder is not None, "Worker non initialisé"
+    return [_worker_encoder.encode(message) for message in messages]
+
+
+def _chunks(messages: Iterable[str], chunksize: int) -> Iterator[list[str]]:
+    iterator = iter(messages)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def encode_many(
+    messages: Iterable[str],
+    version: str = "1",
+    ecc_level: str = "none",
+    workers: int | None = None,
+    chunksize: int = 16,
+    hex_size: float = 10.0,
+    quiet_zone: float = 2.0
+) -> Iterator[Image.Image]:
+    """Encode une suite de messages en parallèle et retourne les images dans l'ordre.
+
+    Les messages sont consommés paresseusement et au plus `2 * workers` lots sont
+    en cours à un instant donné : la mémoire reste constante quelle que soit la
+    taille du flux, et le producteur est freiné si le consommateur est plus lent.
+
+    Args:
+        messages: Les messages à encoder (itérable éventuellement infini).
+        version: La version du protocole.
+        ecc_level: Le niveau d'ECC.
+        workers: Le nombre de processus (par défaut, le nombre de cœurs).
+            Avec `workers=1`, l'encodage se fait dans le processus courant.
+        chunksize: Le nombre de messages envoyés à un worker par tâche.
+        hex_size: La distance centre-sommet des hexagones, en pixels.
+        quiet_zone: La marge autour de la grille, en nombre de `hex_size`.
+
+    Yields:
+        L'image de chaque message, dans l'ordre d'entrée.
+    """
+    global _worker_encoder, _worker_params
+    if chunksize < 1:
+        raise ValueError(f"chunksize doit être strictement positif : {chunksize}")
+    workers = workers or os.cpu_count() or 1
+    params: EncoderParams = (version, ecc_level, float(hex_size), float(quiet_zone))
+    # Construit (et valide) l'encodeur une fois dans le parent, avant le fork
+    encoder = HexagonalEncoder(*params)
+
+    if workers == 1:
+        for message in messages:
+            yield encoder.encode(message)
+        return
+
+    previous = (_worker_encoder, _worker_params)
+    _worker_encoder, _worker_params = encoder, params
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=fork_context(),
+                                 initializer=_init_worker, initargs=(params,)) as pool:
+            pending: deque[Future[list[Image.Image]]] = deque()
+            for chunk in _chunks(messages, chunksize):
+                pending.append(pool.submit(_encode_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    finally:
+        _worker_encoder, _worker_params = previous
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import Final, Sequence
+
+import numpy as np
+
+# Imports relatifs car consensus.py est dans core/
+from .hex_grid import AxialPos, HexgridLayout, Hexagon, PixelCoord
+from .constants import SYMBOL_COLORS
+
+# Confiance minimale d'une cellule non effacée
+MIN_CONFIDENCE: Final[float] = 0.5
+# Nombre minimal de voisins lus pour juger un voisinage uniforme
+MIN_UNIFORM_NEIGHBORS: Final[int] = 3
+# Proportion de voisines de même symbole pour qu'une cellule rejoigne une zone uniforme voisine
+PATCH_UNIFORMITY: Final[float] = 0.5
+# Poids d'une lecture effacée lorsqu'elle est cumulée avec d'autres (suivi vidéo)
+ERASURE_WEIGHT: Final[float] = 0.05
+
+
+def build_neighbor_table(positions: Sequence[AxialPos]) -> np.ndarray:
+    """Indices des 6 voisins de chaque cellule (ordre de `Hexagon.get_neighbors`), -1 hors grille.
+
+    Returns:
+        Un tableau en lecture seule de forme (n, 6).
+    """
+    # Layout arbitraire : seul le voisinage logique est utilisé ici
+    neighbor_layout = HexgridLayout(size=1.0, origin=PixelCoord(0, 0))
+    index = {pos: i for i, pos in enumerate(positions)}
+    table = np.array([[index.get(neighbor.pos, -1) for neighbor in Hexagon(pos=pos, layout=neighbor_layout).get_neighbors()]
+                      for pos in positions], dtype=np.intp).reshape(len(positions), 6)
+    table.flags.writeable = False
+    return table
+
+
+@dataclass(frozen=True)
+class ConsensusScores:
+    """Scores de cohérence de chaque cellule avec ses voisines, forme (n,) pour chaque attribut.
+
+    Attributs:
+        support: La proportion des points d'échantillonnage en faveur du symbole retenu.
+        disagreement: La proportion des points en faveur d'une couleur qu'aucune voisine
+            n'explique. Un débordement depuis une cellule voisine (flou, recalage imparfait)
+            est attendu ; une couleur étrangère au voisinage signale un reflet ou une tache.
+        uniformity: La proportion des voisines lues avec le même symbole. Un voisinage
+            uniforme est fréquent (remplissage, messages répétitifs) : il ne rend suspecte
+            qu'une cellule dont les votes sont déjà partagés (bord d'un reflet).
+        erasures: Les cellules dont la lecture est probablement fausse (effacements).
+    """
+    support: np.ndarray
+    disagreement: np.ndarray
+    uniformity: np.ndarray
+    erasures: np.ndarray
+
+    @property
+    def confidence(self) -> np.ndarray:
+        """La confiance de chaque lecture : le soutien, diminué du désaccord inexpliqué."""
+        return np.clip(self.support - self.disagreement, 0.0, 1.0)
+
+    @property
+    def weights(self) -> np.ndarray:
+        """Le poids de chaque lecture pour un cumul : sa confiance, ou `ERASURE_WEIGHT` si effacée."""
+        return np.where(self.erasures, ERASURE_WEIGHT, self.confidence)
+
+
+def neighbor_consensus(
+    probabilities: np.ndarray,
+    neighbors: np.ndarray,
+    min_confidence: float = MIN_CONFIDENCE
+) -> ConsensusScores:
+    """Évalue toutes les cellules d'une lecture d'un seul coup, à partir de leurs voisines.
+
+    Args:
+        probabilities: La proportion de points d'échantillonnage de chaque couleur, forme (n, 4).
+        neighbors: La table des voisins (voir `build_neighbor_table`), forme (n, 6).
+        min_confidence: La confiance en dessous de laquelle une cellule est effacée.
+    """
+    symbols = probabilities.argmax(axis=1)
+    support = probabilities.max(axis=1)
+    # Une cellule hors champ (aucun vote) n'est la voisine de personne
+    valid = (neighbors >= 0) & (support > 0)[neighbors]
+    neighbor_symbols = np.where(valid, symbols[neighbors], -1)
+
+    # Couleurs expliquées : celle de la cellule et celles de ses voisines
+    palette = np.arange(len(SYMBOL_COLORS))
+    explained = (neighbor_symbols[..., None] == palette).any(axis=1)
+    explained[np.arange(len(symbols)), symbols] = True
+    disagreement = np.where(explained, 0.0, probabilities).sum(axis=1)
+
+    valid_count = valid.sum(axis=1)
+    same = ((neighbor_symbols == symbols[:, None]) & valid).sum(axis=1)
+    uniformity = same / np.maximum(valid_count, 1)
+    uniform = (same == valid_count) & (valid_count >= MIN_UNIFORM_NEIGHBORS)
+    # Une zone uniforme s'étend aux cellules de même symbole, majoritairement entourées de ce symbole
+    joins_patch = (uniform[neighbors] & (neighbor_symbols == symbols[:, None])).any(axis=1)
+    patch = uniform | (joins_patch & (uniformity >= PATCH_UNIFORMITY))
+
+    # Le remplissage du message (symbole 0) et les messages répétitifs forment aussi des
+    # zones uniformes : une telle zone n'efface que les cellules dont les votes sont partagés
+    erasures = (support - disagreement < min_confidence) | (patch & (support < 1.0))
+    return ConsensusScores(support=support, disagreement=disagreement, uniformity=uniformity, erasures=erasures)
@@ -37,3 +37,18 @@ FINDER_POS_TR: Final[AxialPos] = AxialPos(0, -8)  # Haut-Droit logique
 FINDER_POS_BL: Final[AxialPos] = AxialPos(-8, 8)  # Bas-Gauche logique
 
 # On pourrait ajouter ici d'autres constantes liées au protocole à l'avenir.
+
+# --- Mapping Symboles <-> Couleurs (Plan §1.1) ---
+# L'index dans le tuple est la valeur du symbole de 2 bits :
+# 00 -> Noir, 01 -> Rouge, 10 -> Bleu, 11 -> Blanc
+SYMBOL_COLORS: Final[tuple[ProtocolColor, ...]] = (
+    ProtocolColor.BLACK,
+    ProtocolColor.RED,
+    ProtocolColor.BLUE,
+    ProtocolColor.WHITE,
+)
+BITS_PER_SYMBOL: Final[int] = 2
+
+# Niveaux d'ECC acceptés. Le module Reed-Solomon (Plan §4.4) n'existe pas encore :
+# seul le niveau "none" (aucune redondance) est disponible pour l'instant.
+ECC_LEVELS: Final[tuple[str, ...]] = ("none",)
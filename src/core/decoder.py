@@ -0,0 +1,395 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Final
+import math
+
+import numpy as np
+from PIL import Image
+
+# Imports relatifs car decoder.py est dans core/
+from ..utils.validators import OneOf
+from .hex_grid import AxialPos, HexgridLayout, PixelCoord
+from .constants import ProtocolColor, SYMBOL_COLORS
+from .structure import PROTOCOL_VERSIONS, get_version, grid_positions, build_data_path
+from .encoder import SYMBOLS_PER_BYTE, LENGTH_HEADER_SYMBOLS, symbols_to_bytes
+from .consensus import ConsensusScores, MIN_CONFIDENCE, build_neighbor_table, neighbor_consensus
+from .geometry_cache import default_cache
+
+# Quantification de la table de classification : 5 bits par canal (32 x 32 x 32 entrées)
+LUT_SHIFT: Final[int] = 3
+# Rayon (en tailles d'hexagone) du cercle d'échantillonnage de l'anneau d'un repère :
+# toujours dans l'anneau, entre l'hexagone central (rayon 1) et l'extérieur (rayon >= 2)
+FINDER_RING_RADIUS: Final[float] = 1.5
+FINDER_RING_SAMPLES: Final[int] = 24
+FINDER_RING_MIN_SCORE: Final[float] = 0.6
+# Écart maximal toléré entre le triangle des repères détectés et le triangle attendu
+FINDER_MAX_SHAPE_ERROR: Final[float] = 0.25
+# Rapport maximal entre les tailles des 3 repères d'une même grille
+FINDER_MAX_SIZE_RATIO: Final[float] = 1.5
+# Plage de l'écart entre deux repères, rapporté à l'écart attendu pour leur taille : écarte
+# les triangles formés par les repères de grilles voisines de même taille
+FINDER_SPACING_RANGE: Final[tuple[float, float]] = (0.5, 2.0)
+# Nombre maximal de triangles de repères de tailles compatibles évalués : au-delà,
+# l'image est refusée plutôt que d'en écarter arbitrairement des candidats
+MAX_FINDER_COMBINATIONS: Final[int] = 16_000_000
+# Nombre de triangles évalués par bloc (borne la mémoire de l'appariement)
+FINDER_COMBINATIONS_CHUNK: Final[int] = 262_144
+
+_WHITE: Final[int] = SYMBOL_COLORS.index(ProtocolColor.WHITE)
+_RED: Final[int] = SYMBOL_COLORS.index(ProtocolColor.RED)
+_BLUE: Final[int] = SYMBOL_COLORS.index(ProtocolColor.BLUE)
+
+ImageInput = str | Path | Image.Image
+
+
+class DecodeError(ValueError):
+    """Levée lorsqu'une image ne peut pas être décodée."""
+
+
+@dataclass(frozen=True)
+class DecoderTables:
+    """Tables précalculées pour une version, partagées par tous les décodages.
+
+    Attributs:
+        positions: Les positions de la grille (ordre de `grid_positions`).
+        centers: Les centres des cellules pour un layout de taille 1 et d'origine (0,0), forme (n, 2).
+        data_index: Les indices (dans `positions`) des cellules du chemin de données.
+        finder_types: Le type de chaque repère, dans l'ordre de `finder_centers`.
+        finder_centers: Les centres des repères (layout unitaire), forme (3, 2).
+        stencil: Les points d'échantillonnage relatifs au centre d'une cellule (layout unitaire), forme (k, 2).
+        neighbors: Les indices des 6 voisins de chaque cellule (-1 hors grille), forme (n, 6).
+    """
+    positions: tuple[AxialPos, ...]
+    centers: np.ndarray
+    data_index: np.ndarray
+    finder_types: tuple[str, ...]
+    finder_centers: np.ndarray
+    stencil: np.ndarray
+    neighbors: np.ndarray
+
+
+@dataclass(frozen=True)
+class FinderCandidate:
+    """Un hexagone blanc entouré d'un anneau uniforme, candidat au rôle de repère."""
+    center: tuple[float, float]
+    size: float
+    ring: int
+    score: float
+
+
+@dataclass(frozen=True)
+class CellReading:
+    """Résultat de la lecture des cellules d'une image.
+
+    Attributs:
+        transform: La transformation affine (2, 3) du layout unitaire vers les pixels.
+        probabilities: La proportion de points d'échantillonnage de chaque couleur, forme (n, 4).
+    """
+    transform: np.ndarray
+    probabilities: np.ndarray
+
+    @property
+    def symbols(self) -> np.ndarray:
+        """Le symbole le plus probable de chaque cellule."""
+        return self.probabilities.argmax(axis=1).astype(np.uint8)
+
+    @property
+    def confidences(self) -> np.ndarray:
+        """La probabilité du symbole retenu pour chaque cellule."""
+        return self.probabilities.max(axis=1)
+
+
+@lru_cache(maxsize=None)
+def build_classifier_lut() -> np.ndarray:
+    """Construit la table RVB quantifiée -> symbole de la couleur du protocole la plus proche."""
+    return default_cache().load_or_build("classifier", (LUT_SHIFT,), _compute_classifier_lut)
+
+
+def _compute_classifier_lut() -> np.ndarray:
+    levels = (np.arange(256 >> LUT_SHIFT) << LUT_SHIFT) + (1 << (LUT_SHIFT - 1))
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1).astype(np.float32)
+    palette = np.array([color.rgb for color in SYMBOL_COLORS], dtype=np.float32)
+    distances = ((grid[..., None, :] - palette) ** 2).sum(axis=-1)
+    return distances.argmin(axis=-1).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def build_decoder_tables(version: str) -> DecoderTables:
+    """Précalcule les tables de décodage d'une version.
+
+    Les tables les plus coûteuses (centres, voisins, chemin de données) sont
+    lues depuis le cache sur disque (`default_cache`) lorsqu'elles y figurent.
+    """
+    unit_layout = HexgridLayout(size=1.0, origin=PixelCoord(0.0, 0.0))
+    positions = grid_positions(version)
+    index = {pos: i for i, pos in enumerate(positions)}
+
+    def center(pos: AxialPos) -> tuple[float, float]:
+        pixel = PixelCoord.from_axial(pos, unit_layout)
+        return (pixel.x, pixel.y)
+
+    finders = get_version(version).finders
+    angles = np.radians(np.arange(6) * 60.0)
+    stencil = np.vstack([[0.0, 0.0], 0.45 * np.column_stack([np.cos(angles), np.sin(angles)])])
+    cache = default_cache()
+    tables = DecoderTables(
+        positions=positions,
+        centers=cache.load_or_build("centers", (version,), lambda: np.array([center(pos) for pos in positions])),
+        data_index=cache.load_or_build(
+            "data_index", (version,), lambda: np.array([index[pos] for pos in build_data_path(version)], dtype=np.intp)
+        ),
+        finder_types=tuple(pattern_type for pattern_type, _ in finders),
+        finder_centers=np.array([center(pos) for _, pos in finders]),
+        stencil=stencil,
+        neighbors=cache.load_or_build("neighbors", (version,), lambda: build_neighbor_table(positions)),
+    )
+    for array in (tables.centers, tables.data_index, tables.finder_centers, tables.stencil):
+        array.flags.writeable = False
+    return tables
+
+
+def load_image(image_input: ImageInput) -> Image.Image:
+    """Charge une image depuis un chemin ou retourne l'objet Pillow fourni."""
+    if isinstance(image_input, Image.Image):
+        return image_input
+    return Image.open(image_input)
+
+
+def to_rgb_array(image: Image.Image) -> np.ndarray:
+    """Retourne les pixels RVB d'une image sous forme de tableau (hauteur, largeur, 3)."""
+    return np.asarray(image if image.mode == "RGB" else image.convert("RGB"))
+
+
+def _white_components(mask: np.ndarray) -> list[tuple[float, float, float, int, int]]:
+    """Étiquette les composantes 4-connexes d'un masque par plages de pixels.
+
+    Returns:
+        Pour chaque composante : (x moyen, y moyen, aire, largeur, hauteur) de sa boîte englobante.
+    """
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    transitions = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(transitions == 1)
+    _, ends = np.nonzero(transitions == -1)
+    if len(starts) == 0:
+        return []
+
+    parent = list(range(len(starts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    row_first = np.searchsorted(rows, np.arange(height + 1)).tolist()
+    starts_list, ends_list = starts.tolist(), ends.tolist()
+    for y in range(1, height):
+        i, i_end = row_first[y - 1], row_first[y]
+        j, j_end = row_first[y], row_first[y + 1]
+        while i < i_end and j < j_end:
+            if starts_list[i] < ends_list[j] and starts_list[j] < ends_list[i]:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[root_j] = root_i
+            if ends_list[i] < ends_list[j]:
+                i += 1
+            else:
+                j += 1
+
+    roots = np.array([find(i) for i in range(len(starts))])
+    _, labels = np.unique(roots, return_inverse=True)
+    count = labels.max() + 1
+    lengths = (ends - starts).astype(np.float64)
+    area = np.bincount(labels, lengths, count)
+    mean_x = np.bincount(labels, lengths * (starts + ends - 1) / 2, count) / area
+    mean_y = np.bincount(labels, lengths * rows, count) / area
+    x_min = np.full(count, width)
+    np.minimum.at(x_min, labels, starts)
+    x_max = np.zeros(count, dtype=np.intp)
+    np.maximum.at(x_max, labels, ends)
+    y_min = np.full(count, height)
+    np.minimum.at(y_min, labels, rows)
+    y_max = np.zeros(count, dtype=np.intp)
+    np.maximum.at(y_max, labels, rows + 1)
+    return list(zip(mean_x.tolist(), mean_y.tolist(), area.tolist(),
+                    (x_max - x_min).tolist(), (y_max - y_min).tolist()))
+
+
+def find_finder_candidates(labels: np.ndarray, min_area: float = 9.0) -> list[FinderCandidate]:
+    """Cherche les hexagones blancs entourés d'un anneau rouge ou bleu.
+
+    Args:
+        labels: L'image classifiée (un symbole par pixel).
+        min_area: L'aire minimale (en pixels) d'un hexagone central.
+    """
+    height, width = labels.shape
+    angles = np.linspace(0, 2 * math.pi, FINDER_RING_SAMPLES, endpoint=False)
+    circle = np.column_stack([np.cos(angles), np.sin(angles)])
+    candidates: list[FinderCandidate] = []
+    for x, y, area, box_w, box_h in _white_components(labels == _WHITE):
+        if area < min_area or not 0.55 <= area / (box_w * box_h) <= 0.95:
+            continue
+        if max(box_w, box_h) > 1.6 * min(box_w, box_h):
+            continue
+        size = math.sqrt(area / (3 * math.sqrt(3) / 2))
+        ring_points = np.rint(circle * FINDER_RING_RADIUS * size + (x, y)).astype(np.intp)
+        inside = ((ring_points[:, 0] >= 0) & (ring_points[:, 0] < width)
+                  & (ring_points[:, 1] >= 0) & (ring_points[:, 1] < height))
+        if not inside.all():
+            continue
+        ring = labels[ring_points[:, 1], ring_points[:, 0]]
+        for color in (_RED, _BLUE):
+            score = float((ring == color).mean())
+            if score >= FINDER_RING_MIN_SCORE:
+                candidates.append(FinderCandidate((x, y), size, color, score))
+    return candidates
+
+
+def fit_affine(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Calcule la transformation affine (2, 3) envoyant 3 points `source` sur `target`."""
+    matrix = np.column_stack([source, np.ones(len(source))])
+    try:
+        return np.linalg.solve(matrix, target).T
+    except np.linalg.LinAlgError:
+        raise DecodeError("Repères d'alignement alignés : transformation impossible") from None
+
+
+def apply_affine(transform: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Applique une transformation affine (2, 3) à des points (..., 2)."""
+    return points @ transform[:, :2].T + transform[:, 2]
+
+
+class HexagonalDecoder:
+    """Décode une image de grille hexagonale en message texte (Plan §3.4).
+
+    Les tables par version (positions, gabarit d'échantillonnage, table de
+    classification des couleurs) sont précalculées une seule fois par processus
+    et partagées par tous les décodeurs.
+    """
+    version = OneOf[str](*PROTOCOL_VERSIONS)
+
+    def __init__(self, version: str = "1"):
+        self.version = version
+        self.tables: DecoderTables = build_decoder_tables(version)
+        self.lut: np.ndarray = build_classifier_lut()
+
+    def classify(self, pixels: np.ndarray) -> np.ndarray:
+        """Associe à chaque pixel RVB (forme (..., 3)) le symbole de la couleur du protocole la plus proche."""
+        quantized = pixels >> LUT_SHIFT
+        return self.lut[quantized[..., 0], quantized[..., 1], quantized[..., 2]]
+
+    def match_finders(self, candidates: list[FinderCandidate]) -> np.ndarray:
+        """Choisit les 3 candidats les plus cohérents avec la géométrie des repères.
+
+        Returns:
+            Les centres en pixels des repères, dans l'ordre de `tables.finder_types`, forme (3, 2).
+
+        Raises:
+            DecodeError: Si aucune combinaison de candidats ne convient.
+        """
+        expected = self.tables.finder_centers
+        wanted = [_BLUE if pattern_type == "yaxis" else _RED for pattern_type in self.tables.finder_types]
+        roles = [[c for c in candidates if c.ring == ring] for ring in wanted]
+        if not all(roles):
+            raise DecodeError("Repères d'alignement introuvables")
+        centers = [np.array([complex(*c.center) for c in role]) for role in roles]
+        sizes = [np.array([c.size for c in role]) for role in roles]
+
+        # Paires (repère 0, repère 1) de tailles compatibles, à l'écart attendu pour leur taille
+        src = complex(*(expected[1] - expected[0]))
+        spacing = np.abs(centers[1][None, :] - centers[0][:, None]) / (np.add.outer(sizes[0], sizes[1]) / 2 * abs(src))
+        first, second = np.nonzero(
+            (np.maximum.outer(sizes[0], sizes[1]) <= FINDER_MAX_SIZE_RATIO * np.minimum.outer(sizes[0], sizes[1]))
+            & (spacing >= FINDER_SPACING_RANGE[0]) & (spacing <= FINDER_SPACING_RANGE[1])
+        )
+        # Les candidats du repère 2 compatibles avec une paire forment un intervalle une fois triés par taille
+        order = np.argsort(sizes[2], kind="stable")
+        pair_min = np.minimum(sizes[0][first], sizes[1][second])
+        pair_max = np.maximum(sizes[0][first], sizes[1][second])
+        low = np.searchsorted(sizes[2][order], pair_max / FINDER_MAX_SIZE_RATIO, side="left")
+        counts = np.maximum(np.searchsorted(sizes[2][order], pair_min * FINDER_MAX_SIZE_RATIO, side="right") - low, 0)
+        total = int(counts.sum())
+        if total > MAX_FINDER_COMBINATIONS:
+            raise DecodeError(f"Image trop encombrée : {total} combinaisons de repères candidats")
+        if total == 0:
+            raise DecodeError("Repères d'alignement introuvables")
+
+        # Les triangles sont évalués par blocs de paires consécutives, un élément par triangle
+        dst_apex = complex(*(expected[2] - expected[0]))
+        ends = np.cumsum(counts)
+        best_error, chosen = np.inf, None
+        begin = 0
+        while begin < len(first):
+            done = ends[begin] - counts[begin]
+            stop = max(begin + 1, int(np.searchsorted(ends, done + FINDER_COMBINATIONS_CHUNK, side="right")))
+            block = np.arange(begin, stop)
+            pair = np.repeat(block, counts[block])
+            third = order[np.arange(done, ends[stop - 1]) - np.repeat(ends[block] - counts[block] - low[block], counts[block])]
+            origin, axis, apex = centers[0][first[pair]], centers[1][second[pair]], centers[2][third]
+            # Similitude (sans symétrie) définie par les deux premiers repères
+            dst = axis - origin
+            predicted = origin + dst / src * dst_apex
+            error = np.where((apex != origin) & (apex != axis), np.abs(predicted - apex) / np.abs(dst), np.inf)
+            if len(error) and error.min() < best_error:
+                index = int(np.argmin(error))
+                best_error, chosen = error[index], (first[pair[index]], second[pair[index]], third[index])
+            begin = stop
+        if chosen is None or not best_error <= FINDER_MAX_SHAPE_ERROR:
+            raise DecodeError("Repères d'alignement introuvables")
+        return np.array([roles[axis][index].center for axis, index in enumerate(chosen)])
+
+    def locate(self, labels: np.ndarray) -> np.ndarray:
+        """Détecte les repères et retourne la transformation layout unitaire -> pixels."""
+        found = self.match_finders(find_finder_candidates(labels))
+        return fit_affine(self.tables.finder_centers, found)
+
+    def read_cells(self, pixels: np.ndarray, transform: np.ndarray) -> CellReading:
+        """Échantillonne toutes les cellules de la grille avec le gabarit précalculé.
+
+        Seuls les pixels échantillonnés sont classifiés. Les points hors de l'image
+        ne votent pas : une cellule entièrement hors champ a une probabilité nulle.
+        """
+        height, width = pixels.shape[:2]
+        points = self.tables.centers[:, None, :] + self.tables.stencil[None, :, :]
+        coords = np.rint(apply_affine(transform, points)).astype(np.intp)
+        x, y = coords[..., 0], coords[..., 1]
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        samples = self.classify(pixels[np.clip(y, 0, height - 1), np.clip(x, 0, width - 1)])
+        votes = np.stack([((samples == symbol) & inside).sum(axis=1) for symbol in range(len(SYMBOL_COLORS))], axis=1)
+        return CellReading(transform=transform, probabilities=votes / samples.shape[1])
+
+    def decode_cells(self, image_input: ImageInput) -> CellReading:
+        """Localise la grille dans l'image et lit toutes ses cellules."""
+        pixels = to_rgb_array(load_image(image_input))
+        return self.read_cells(pixels, self.locate(self.classify(pixels)))
+
+    def consensus(self, reading: CellReading, min_confidence: float = MIN_CONFIDENCE) -> ConsensusScores:
+        """Évalue la cohérence de chaque cellule lue avec ses voisines (voir `neighbor_consensus`)."""
+        return neighbor_consensus(reading.probabilities, self.tables.neighbors, min_confidence)
+
+    def data_erasures(self, scores: ConsensusScores) -> np.ndarray:
+        """Les rangs, le long du chemin de données, des symboles effacés (pour la correction d'erreurs)."""
+        return np.flatnonzero(scores.erasures[self.tables.data_index])
+
+    def decode_symbols(self, symbols: np.ndarray) -> str:
+        """Reconstruit le message à partir des symboles de la grille (ordre de `positions`)."""
+        data_symbols = symbols[self.tables.data_index].tolist()
+        length = int.from_bytes(symbols_to_bytes(data_symbols[:LENGTH_HEADER_SYMBOLS]), "big")
+        end = LENGTH_HEADER_SYMBOLS + length * SYMBOLS_PER_BYTE
+        if end > len(data_symbols):
+            raise DecodeError(f"Longueur de message invalide : {length} octets")
+        try:
+            return symbols_to_bytes(data_symbols[LENGTH_HEADER_SYMBOLS:end]).decode("utf-8")
+        except UnicodeDecodeError as error:
+            raise DecodeError(f"Message illisible : {error}") from None
+
+    def decode(self, image_input: ImageInput) -> str:
+        """Décode l'image (chemin, Path ou image Pillow) et retourne le message texte.
+
+        Raises:
+            DecodeError: Si la grille n'est pas trouvée ou si le message est illisible.
+        """
+        return self.decode_symbols(self.decode_cells(image_input).symbols)
@@ -1,5 +1,6 @@
-from typing import Literal, Sequence
-from PIL import ImageDraw
+from typing import Literal, Mapping, Sequence
+import math
+from PIL import Image, ImageDraw
 
 # Imports relatifs car drawing.py est dans core/
 from .hex_grid import Hexagon, AxialPos, HexgridLayout, PixelCoord
@@ -62,3 +63,94 @@ def draw_finder_pattern(
     neighbors = center_hex.get_neighbors()
     for neighbor_hex in neighbors:
         draw_hexagon(draw, neighbor_hex, fill_color=ring_color, outline_color=ProtocolColor.BLACK)
+
+
+def draw_cells(
+    draw: ImageDraw.ImageDraw,
+    layout: HexgridLayout,
+    cells: Mapping[AxialPos, ProtocolColor],
+    outline_color: ProtocolColor = ProtocolColor.BLACK
+) -> None:
+    """Dessine un ensemble de cellules colorées, dans l'ordre de la table `cells`.
+
+    Args:
+        draw: L'objet Pillow ImageDraw sur lequel dessiner.
+        layout: Le layout de la grille.
+        cells: La couleur de chaque cellule, indexée par sa position axiale.
+        outline_color: La couleur du contour des cellules.
+    """
+    for pos, color in cells.items():
+        draw_hexagon(draw, Hexagon(pos=pos, layout=layout), fill_color=color, outline_color=outline_color)
+
+
+def render_cells(
+    layout: HexgridLayout,
+    cells: Mapping[AxialPos, ProtocolColor],
+    image_size: tuple[int, int],
+    background: ProtocolColor = ProtocolColor.WHITE
+) -> Image.Image:
+    """Crée une nouvelle image RGB contenant les cellules données.
+
+    Args:
+        layout: Le layout de la grille.
+        cells: La couleur de chaque cellule, indexée par sa position axiale.
+        image_size: La taille (largeur, hauteur) de l'image.
+        background: La couleur de fond (zone de silence autour de la grille).
+    """
+    image = Image.new("RGB", image_size, background.rgb)
+    draw_cells(ImageDraw.Draw(image), layout, cells)
+    return image
+
+
+def render_cells_antialiased(
+    layout: HexgridLayout,
+    cells: Mapping[AxialPos, ProtocolColor],
+    image_size: tuple[int, int],
+    supersample: int = 4,
+    band_height: int = 16,
+    background: ProtocolColor = ProtocolColor.WHITE
+) -> Image.Image:
+    """Comme `render_cells`, mais avec des bords de cellules anticrénelés.
+
+    Chaque bande horizontale de `band_height` lignes est dessinée à une résolution
+    `supersample` fois plus fine, puis réduite par moyenne des sous-pixels : la
+    couleur d'un pixel de bord est proportionnelle à la surface couverte par chaque
+    cellule. La mémoire utilisée est celle de l'image finale plus une seule bande
+    suréchantillonnée (et non une image `supersample²` fois plus grande).
+
+    Args:
+        layout: Le layout de la grille.
+        cells: La couleur de chaque cellule, indexée par sa position axiale.
+        image_size: La taille (largeur, hauteur) de l'image.
+        supersample: Le facteur de suréchantillonnage k (k x k sous-pixels par pixel).
+        band_height: La hauteur des bandes traitées, en pixels de l'image finale.
+        background: La couleur de fond.
+    """
+    if supersample < 1 or band_height < 1:
+        raise ValueError(f"Paramètres invalides : supersample={supersample}, band_height={band_height}")
+    width, height = image_size
+    k = supersample
+    output = Image.new("RGB", image_size)
+
+    # Sommets en sous-pixels entiers (le sous-pixel j couvre le pixel j // k). Pillow tronque
+    # les coordonnées vers zéro : arrondir avant la translation de chaque bande rend le
+    # résultat indépendant du découpage, y compris pour les ordonnées négatives.
+    polygons = [([(math.floor(k * v.x + k / 2), math.floor(k * v.y + k / 2)) for v in layout.get_hexagon_vertices(pos)], color.rgb)
+                for pos, color in cells.items()]
+    extents = [(min(y for _, y in vertices) - k, max(y for _, y in vertices) + k) for vertices, _ in polygons]
+
+    for top in range(0, height, band_height):
+        rows = min(band_height, height - top)
+        strip = Image.new("RGB", (width * k, rows * k), background.rgb)
+        draw = ImageDraw.Draw(strip)
+        band_start, band_end = top * k, (top + rows) * k
+        # Cellules recouvrant la bande, dans l'ordre de dessin
+        for (vertices, rgb), (y_min, y_max) in zip(polygons, extents):
+            if y_max < band_start or y_min >= band_end:
+                continue
+            shifted = [(x, y - band_start) for x, y in vertices]
+            draw.polygon(shifted, fill=rgb)
+            draw.line(shifted + shifted[:1], fill=ProtocolColor.BLACK.rgb, width=k)
+        # Moyenne de chaque bloc k x k de sous-pixels
+        output.paste(strip.reduce(k) if k > 1 else strip, (0, top))
+    return output
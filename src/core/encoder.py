@@ -0,0 +1,90 @@
+from typing import Final, Iterable, Mapping
+from PIL import Image
+
+# Imports relatifs car encoder.py est dans core/
+from ..utils.validators import OneOf
+from .hex_grid import AxialPos, HexgridLayout
+from .constants import ProtocolColor, SYMBOL_COLORS, BITS_PER_SYMBOL, ECC_LEVELS
+from .structure import PROTOCOL_VERSIONS, build_structure_layer, build_data_path, build_layout
+from .drawing import render_cells
+from .scaled_render import ScaledRenderer
+
+SYMBOLS_PER_BYTE: Final[int] = 8 // BITS_PER_SYMBOL
+# Longueur du message (en octets) écrite sur 16 bits au début du chemin de données
+LENGTH_HEADER_SYMBOLS: Final[int] = 16 // BITS_PER_SYMBOL
+
+
+def bytes_to_symbols(data: bytes) -> list[int]:
+    """Découpe des octets en symboles de 2 bits, bits de poids fort en premier."""
+    symbols: list[int] = []
+    for byte in data:
+        for shift in range(8 - BITS_PER_SYMBOL, -1, -BITS_PER_SYMBOL):
+            symbols.append((byte >> shift) & 0b11)
+    return symbols
+
+
+def symbols_to_bytes(symbols: list[int]) -> bytes:
+    """Opération inverse de `bytes_to_symbols`. La longueur doit être un multiple de 4."""
+    if len(symbols) % SYMBOLS_PER_BYTE != 0:
+        raise ValueError(f"Nombre de symboles invalide : {len(symbols)} (multiple de {SYMBOLS_PER_BYTE} attendu)")
+    data = bytearray()
+    for start in range(0, len(symbols), SYMBOLS_PER_BYTE):
+        byte = 0
+        for symbol in symbols[start:start + SYMBOLS_PER_BYTE]:
+            byte = (byte << BITS_PER_SYMBOL) | symbol
+        data.append(byte)
+    return bytes(data)
+
+
+class HexagonalEncoder:
+    """Encode un message texte en une image de grille hexagonale (Plan §3.4).
+
+    Les éléments de structure et le chemin de données sont précalculés une seule
+    fois par version (voir `src.core.structure`) et partagés entre encodeurs.
+    """
+    version = OneOf[str](*PROTOCOL_VERSIONS)
+    ecc_level = OneOf[str](*ECC_LEVELS)
+
+    def __init__(self, version: str = "1", ecc_level: str = "none", hex_size: float = 10.0, quiet_zone: float = 2.0):
+        self.version = version
+        self.ecc_level = ecc_level
+        self.hex_size = hex_size
+        self.quiet_zone = quiet_zone
+        self.structure: Mapping[AxialPos, ProtocolColor] = build_structure_layer(version)
+        self.data_path: tuple[AxialPos, ...] = build_data_path(version)
+        self.layout: HexgridLayout
+        self.image_size: tuple[int, int]
+        self.layout, self.image_size = build_layout(version, hex_size, quiet_zone)
+
+    @property
+    def capacity(self) -> int:
+        """Nombre maximal d'octets de message pour cette version."""
+        return (len(self.data_path) - LENGTH_HEADER_SYMBOLS) // SYMBOLS_PER_BYTE
+
+    def encode_symbols(self, text_message: str) -> list[int]:
+        """Convertit le message en la suite complète des symboles du chemin de données."""
+        payload = text_message.encode("utf-8")
+        if len(payload) > self.capacity:
+            raise ValueError(
+                f"Message trop long : {len(payload)} octets (capacité de la version {self.version} : {self.capacity})"
+            )
+        symbols = bytes_to_symbols(len(payload).to_bytes(2, "big")) + bytes_to_symbols(payload)
+        # Remplissage des cellules restantes avec le symbole 00 (Noir)
+        symbols.extend([0] * (len(self.data_path) - len(symbols)))
+        return symbols
+
+    def encode_cells(self, text_message: str) -> dict[AxialPos, ProtocolColor]:
+        """Retourne la couleur de chaque cellule de la grille pour le message donné."""
+        cells: dict[AxialPos, ProtocolColor] = dict(self.structure)
+        for pos, symbol in zip(self.data_path, self.encode_symbols(text_message)):
+            cells[pos] = SYMBOL_COLORS[symbol]
+        return cells
+
+    def encode(self, text_message: str) -> Image.Image:
+        """Encode le message et retourne l'image Pillow correspondante."""
+        return render_cells(self.layout, self.encode_cells(text_message), self.image_size)
+
+    def encode_scaled(self, text_message: str, scales: Iterable[int]) -> list[Image.Image]:
+        """Encode le message une fois et le rend à plusieurs échelles entières de `hex_size` (voir `ScaledRenderer`)."""
+        renderer = ScaledRenderer(self.version, self.hex_size, self.quiet_zone)
+        return renderer.render_many(self.encode_cells(text_message), scales)
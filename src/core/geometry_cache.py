@@ -0,0 +1,156 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Final, Hashable
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import PIL
+
+# Répertoire du cache (variable d'environnement) ; une valeur vide désactive l'écriture sur disque
+CACHE_DIR_ENV: Final[str] = "HEXQR_CACHE_DIR"
+DEFAULT_CACHE_DIR: Final[Path] = Path.home() / ".cache" / "weird-qr-code"
+DEFAULT_MAX_BYTES: Final[int] = 256 * 1024 * 1024
+# Modules dont le code détermine le contenu des tables : les modifier invalide le cache
+_GEOMETRY_MODULES: Final[tuple[str, ...]] = (
+    "hex_grid.py", "constants.py", "structure.py", "consensus.py", "decoder.py", "scaled_render.py", "geometry_cache.py",
+)
+
+
+@lru_cache(maxsize=None)
+def code_version() -> str:
+    """Empreinte du code qui calcule les tables (les tables d'une autre version du code sont ignorées).
+
+    Les versions de numpy et de Pillow en font partie : les images d'étiquettes sont
+    des rastérisations Pillow, identiques au rendu de l'encodeur pour une version donnée.
+    """
+    digest = hashlib.sha256()
+    for name in _GEOMETRY_MODULES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    digest.update(f"numpy {np.__version__} Pillow {PIL.__version__}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class GeometryCache:
+    """Cache sur disque de tableaux précalculés (centres, voisins, images d'étiquettes...).
+
+    Chaque tableau est un fichier `.npy` nommé d'après son nom, ses paramètres
+    et l'empreinte du code (`code_version`). Les fichiers sont ouverts en
+    projection mémoire, en lecture seule : les processus qui chargent la même
+    table partagent ses pages au lieu d'en calculer chacun une copie.
+    L'écriture est atomique (fichier temporaire puis `os.replace`), si bien que
+    des processus concurrents ne lisent jamais une table incomplète. Au-delà de
+    `max_bytes`, les tables les moins récemment utilisées sont supprimées.
+
+    Args:
+        directory: Le répertoire du cache, ou None pour ne rien écrire sur disque.
+        max_bytes: La taille maximale du cache, en octets.
+    """
+
+    def __init__(self, directory: str | Path | None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes doit être positif : {max_bytes}")
+        self.directory = Path(directory) if directory is not None else None
+        self.max_bytes = max_bytes
+
+    def path(self, name: str, params: Hashable) -> Path | None:
+        """Le fichier d'une table, ou None si le cache est désactivé."""
+        if self.directory is None:
+            return None
+        key = hashlib.sha256(repr((name, params, code_version())).encode("utf-8")).hexdigest()[:24]
+        return self.directory / f"{name}-{key}.npy"
+
+    def load_or_build(self, name: str, params: Hashable, build: Callable[[], np.ndarray]) -> np.ndarray:
+        """Retourne la table (en lecture seule), en la calculant et l'enregistrant si elle est absente.
+
+        Le cache n'est qu'une optimisation : un fichier illisible est recalculé, et
+        une erreur d'écriture (disque plein, répertoire en lecture seule) est ignorée.
+        """
+        path = self.path(name, params)
+        if path is not None:
+            try:
+                array = np.load(path, mmap_mode="r")
+            except (OSError, ValueError, EOFError):
+                pass
+            else:
+                try:
+                    os.utime(path)  # Marque la table comme récemment utilisée
+                except OSError:
+                    pass  # Cache en lecture seule (partagé, provisionné) : la table reste utilisable
+                return array
+        array = np.ascontiguousarray(build())
+        if path is not None:
+            try:
+                self._store(path, array)
+                self.evict()
+                return np.load(path, mmap_mode="r")
+            except (OSError, ValueError, EOFError):
+                pass
+        array.flags.writeable = False
+        return array
+
+    def _store(self, path: Path, array: np.ndarray) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                np.save(file, array, allow_pickle=False)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    def entries(self) -> list[Path]:
+        """Les tables du cache, de la moins à la plus récemment utilisée."""
+        if self.directory is None or not self.directory.is_dir():
+            return []
+        files = [(path.stat().st_mtime, path) for path in self.directory.glob("*.npy")]
+        return [path for _, path in sorted(files)]
+
+    def size(self) -> int:
+        """La taille totale des tables du cache, en octets."""
+        return sum(path.stat().st_size for path in self.entries())
+
+    def evict(self) -> int:
+        """Supprime les tables les moins récemment utilisées jusqu'à respecter `max_bytes`.
+
+        Les projections déjà ouvertes restent valides. Retourne le nombre de tables supprimées.
+        """
+        entries = self.entries()
+        total = sum(path.stat().st_size for path in entries)
+        removed = 0
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            size = path.stat().st_size
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue  # Table projetée par un processus (Windows) : supprimée plus tard
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Supprime toutes les tables du cache."""
+        for path in self.entries():
+            path.unlink(missing_ok=True)
+
+
+_default_cache: GeometryCache | None = None
+
+
+def default_cache() -> GeometryCache:
+    """Le cache du processus, dans `$HEXQR_CACHE_DIR` (par défaut `~/.cache/weird-qr-code`)."""
+    global _default_cache
+    if _default_cache is None:
+        directory = os.environ.get(CACHE_DIR_ENV, str(DEFAULT_CACHE_DIR))
+        _default_cache = GeometryCache(directory or None)
+    return _default_cache
+
+
+def set_default_cache(cache: GeometryCache | None) -> None:
+    """Remplace le cache du processus (None : revenir à la configuration par défaut)."""
+    global _default_cache
+    _default_cache = cache
@@ -0,0 +1,267 @@
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Final, Iterator, Mapping, Sequence
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# Imports relatifs car grid_state.py est dans core/
+from .hex_grid import AxialPos
+from .constants import ProtocolColor, SYMBOL_COLORS, FINDER_POS_TL, FINDER_POS_TR, FINDER_POS_BL
+from .structure import get_version, grid_positions
+from .encoder import SYMBOLS_PER_BYTE
+
+# Dispositions connues des repères d'alignement (TL, TR, BL), identifiées sur un octet
+FINDER_LAYOUTS: Final[dict[int, tuple[AxialPos, AxialPos, AxialPos]]] = {
+    1: (FINDER_POS_TL, FINDER_POS_TR, FINDER_POS_BL),
+}
+
+# En-tête d'une grille : magie, version du protocole, rayon, disposition des repères, CRC32
+STATE_HEADER: Final[struct.Struct] = struct.Struct("<4sBBBxI")
+STATE_MAGIC: Final[bytes] = b"HXGS"
+# En-tête d'un corpus : magie, version du format, taille d'un enregistrement, nombre d'enregistrements
+CORPUS_HEADER: Final[struct.Struct] = struct.Struct("<4sBxHQ")
+CORPUS_MAGIC: Final[bytes] = b"HXGC"
+CORPUS_FORMAT: Final[int] = 1
+
+
+def finder_layout_id(version: str) -> int:
+    """Retourne l'identifiant de la disposition des repères d'une version."""
+    positions = tuple(pos for _, pos in get_version(version).finders)
+    for layout_id, layout_positions in FINDER_LAYOUTS.items():
+        if layout_positions == positions:
+            return layout_id
+    raise ValueError(f"Disposition des repères de la version {version!r} non enregistrée")
+
+
+def pack_symbols(symbols: Sequence[int] | np.ndarray) -> bytearray:
+    """Range 4 symboles de 2 bits par octet, premier symbole dans les bits de poids fort."""
+    values = np.asarray(symbols, dtype=np.uint8)
+    if values.size and values.max() > 0b11:
+        raise ValueError(f"Symbole invalide : {int(values.max())} (valeurs de 0 à 3 attendues)")
+    padded = np.zeros(-(-values.size // SYMBOLS_PER_BYTE) * SYMBOLS_PER_BYTE, dtype=np.uint8)
+    padded[:values.size] = values
+    groups = padded.reshape(-1, SYMBOLS_PER_BYTE)
+    packed = (groups[:, 0] << 6) | (groups[:, 1] << 4) | (groups[:, 2] << 2) | groups[:, 3]
+    return bytearray(packed.tobytes())
+
+
+def unpack_symbols(packed: bytes | bytearray | memoryview | np.ndarray, count: int) -> np.ndarray:
+    """Opération inverse de `pack_symbols`. Fonctionne aussi sur un tableau (..., octets) de grilles."""
+    data = np.frombuffer(packed, dtype=np.uint8) if not isinstance(packed, np.ndarray) else packed
+    shifts = np.array([6, 4, 2, 0], dtype=np.uint8)
+    symbols = (data[..., None] >> shifts) & 0b11
+    return symbols.reshape(*data.shape[:-1], -1)[..., :count]
+
+
+def _checksum(header_prefix: bytes, payload: bytes | memoryview) -> int:
+    return zlib.crc32(payload, zlib.crc32(header_prefix))
+
+
+@dataclass(frozen=True, eq=False)
+class GridState:
+    """État d'une grille : un symbole de 2 bits par cellule (mapping `SYMBOL_COLORS`).
+
+    Les cellules sont rangées dans l'ordre de `grid_positions(version)`. La charge
+    utile peut être une vue (`memoryview`) sur un tampon externe, par exemple un
+    corpus projeté en mémoire : aucune copie n'est faite à la lecture.
+    """
+    version: str
+    payload: memoryview
+
+    @classmethod
+    def from_symbols(cls, version: str, symbols: Sequence[int] | np.ndarray) -> 'GridState':
+        """Crée un état à partir des symboles de toutes les cellules."""
+        expected = len(grid_positions(version))
+        if len(symbols) != expected:
+            raise ValueError(f"Nombre de symboles invalide : {len(symbols)} ({expected} attendus)")
+        return cls(version, memoryview(pack_symbols(symbols)))
+
+    @classmethod
+    def from_cells(cls, version: str, cells: Mapping[AxialPos, ProtocolColor]) -> 'GridState':
+        """Crée un état à partir de la couleur de chaque cellule de la grille."""
+        return cls.from_symbols(version, [SYMBOL_COLORS.index(cells[pos]) for pos in grid_positions(version)])
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | bytearray | memoryview | mmap.mmap) -> 'GridState':
+        """Lit un état sérialisé par `to_bytes`, sans copier la charge utile.
+
+        Raises:
+            ValueError: Si l'en-tête est invalide ou si la somme de contrôle ne correspond pas.
+        """
+        view = memoryview(buffer).cast("B")
+        if len(view) < STATE_HEADER.size:
+            raise ValueError("Tampon trop court pour un état de grille")
+        magic, version_id, radius, layout_id, checksum = STATE_HEADER.unpack_from(view)
+        if magic != STATE_MAGIC:
+            raise ValueError(f"En-tête d'état de grille invalide : {magic!r}")
+        version = str(version_id)
+        if get_version(version).radius != radius:
+            raise ValueError(f"Rayon {radius} incohérent avec la version {version}")
+        if finder_layout_id(version) != layout_id:
+            raise ValueError(f"Disposition des repères {layout_id} incohérente avec la version {version}")
+        size = cls.payload_size(version)
+        payload = view[STATE_HEADER.size:STATE_HEADER.size + size]
+        if len(payload) != size:
+            raise ValueError("État de grille tronqué")
+        if _checksum(bytes(view[:STATE_HEADER.size - 4]), payload) != checksum:
+            raise ValueError("Somme de contrôle de l'état de grille invalide")
+        return cls(version, payload)
+
+    @staticmethod
+    def payload_size(version: str) -> int:
+        """Taille en octets de la charge utile d'une version."""
+        return -(-len(grid_positions(version)) // SYMBOLS_PER_BYTE)
+
+    @staticmethod
+    def record_size(version: str) -> int:
+        """Taille en octets d'un état sérialisé (en-tête compris)."""
+        return STATE_HEADER.size + GridState.payload_size(version)
+
+    def header(self) -> bytes:
+        """En-tête sérialisé (version, rayon, disposition des repères, CRC32)."""
+        prefix = STATE_HEADER.pack(STATE_MAGIC, int(self.version), get_version(self.version).radius,
+                                   finder_layout_id(self.version), 0)[:STATE_HEADER.size - 4]
+        return prefix + struct.pack("<I", _checksum(prefix, self.payload))
+
+    def to_bytes(self) -> bytes:
+        """Sérialise l'état (en-tête suivi de la charge utile)."""
+        return self.header() + self.payload.tobytes()
+
+    def symbols(self) -> np.ndarray:
+        """Les symboles de toutes les cellules, forme (n,)."""
+        return unpack_symbols(self.payload, len(grid_positions(self.version)))
+
+    def cells(self) -> dict[AxialPos, ProtocolColor]:
+        """La couleur de chaque cellule de la grille."""
+        return {pos: SYMBOL_COLORS[symbol] for pos, symbol in zip(grid_positions(self.version), self.symbols().tolist())}
+
+    def diff(self, other: 'GridState') -> list[AxialPos]:
+        """Les positions des cellules dont le symbole diffère entre deux états."""
+        if other.version != self.version:
+            raise ValueError(f"Versions différentes : {self.version} et {other.version}")
+        changed = np.frombuffer(self.payload, dtype=np.uint8) ^ np.frombuffer(other.payload, dtype=np.uint8)
+        differing = np.flatnonzero(unpack_symbols(changed, len(grid_positions(self.version))))
+        positions = grid_positions(self.version)
+        return [positions[i] for i in differing.tolist()]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GridState):
+            return NotImplemented
+        return self.version == other.version and self.payload == other.payload
+
+    def __hash__(self) -> int:
+        return hash((self.version, self.payload.tobytes()))
+
+
+class GridCorpusWriter:
+    """Écrit une suite d'états de grille (de même version) dans un fichier de corpus.
+
+    Usage :
+        with GridCorpusWriter("grilles.hxgc") as writer:
+            writer.write(state)
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.count = 0
+        self._record_size: int | None = None
+        self._file: BinaryIO = open(self.path, "wb")
+        self._file.write(CORPUS_HEADER.pack(CORPUS_MAGIC, CORPUS_FORMAT, 0, 0))
+
+    def write(self, state: GridState) -> None:
+        """Ajoute un état à la fin du corpus."""
+        record = state.to_bytes()
+        if self._record_size is None:
+            self._record_size = len(record)
+        elif len(record) != self._record_size:
+            raise ValueError("Toutes les grilles d'un corpus doivent avoir la même version")
+        self._file.write(record)
+        self.count += 1
+
+    def close(self) -> None:
+        """Complète l'en-tête (nombre d'enregistrements) et ferme le fichier."""
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(CORPUS_HEADER.pack(CORPUS_MAGIC, CORPUS_FORMAT, self._record_size or 0, self.count))
+        self._file.close()
+
+    def __enter__(self) -> 'GridCorpusWriter':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        self.close()
+
+
+class GridCorpus:
+    """Lecture d'un corpus d'états de grille projeté en mémoire (`mmap`).
+
+    Les états retournés sont des vues sur le fichier : ouvrir un corpus de
+    plusieurs millions de grilles ne lit rien tant que les grilles ne sont pas
+    consultées, et les processus qui ouvrent le même fichier partagent ses pages.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < CORPUS_HEADER.size:
+                raise ValueError(f"Fichier de corpus invalide : {self.path}")
+            self._mmap: mmap.mmap | None = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, file_format, self.record_size, self.count = CORPUS_HEADER.unpack_from(self._mmap)
+            if magic != CORPUS_MAGIC or file_format != CORPUS_FORMAT:
+                raise ValueError(f"Fichier de corpus invalide : {self.path}")
+            if len(self._mmap) < CORPUS_HEADER.size + self.count * self.record_size:
+                raise ValueError(f"Fichier de corpus tronqué : {self.path}")
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> GridState:
+        if not -self.count <= index < self.count:
+            raise IndexError(f"Index hors du corpus : {index}")
+        start = CORPUS_HEADER.size + (index % self.count) * self.record_size
+        return GridState.from_buffer(memoryview(self._mapping())[start:start + self.record_size])
+
+    def __iter__(self) -> Iterator[GridState]:
+        for index in range(self.count):
+            yield self[index]
+
+    def payloads(self) -> np.ndarray:
+        """Vue (sans copie) des charges utiles de toutes les grilles, forme (count, octets).
+
+        Permet des comparaisons vectorisées sur tout le corpus, sans vérification des sommes de contrôle.
+        """
+        records = np.frombuffer(self._mapping(), dtype=np.uint8, count=self.count * self.record_size,
+                                offset=CORPUS_HEADER.size).reshape(self.count, self.record_size)
+        return records[:, STATE_HEADER.size:]
+
+    def _mapping(self) -> mmap.mmap:
+        if self._mmap is None:
+            raise ValueError(f"Corpus fermé : {self.path}")
+        return self._mmap
+
+    def close(self) -> None:
+        """Ferme le corpus. Les états et vues encore référencés restent lisibles : la
+        projection est alors libérée avec le dernier d'entre eux."""
+        mapping, self._mmap = self._mmap, None
+        if mapping is None:
+            return
+        try:
+            mapping.close()
+        except BufferError:
+            pass  # Des vues exportées référencent encore la projection
+
+    def __enter__(self) -> 'GridCorpus':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        self.close()
@@ -0,0 +1,115 @@
+from typing import Mapping, TypeAlias
+import math
+
+from PIL import Image, ImageDraw
+
+# Imports relatifs car render_surface.py est dans core/
+from .hex_grid import AxialPos, HexgridLayout, Hexagon
+from .constants import ProtocolColor
+from .drawing import draw_hexagon, render_cells
+
+# Boîte en pixels (x0, y0, x1, y1), bornes de fin exclues (convention Pillow `crop`)
+PixelBox: TypeAlias = tuple[int, int, int, int]
+
+
+class RenderSurface:
+    """Image persistante d'une grille, redessinée uniquement là où des cellules changent.
+
+    Chaque modification marque la cellule comme "sale". `flush` repeint la boîte
+    englobante de chaque cellule sale (en redessinant, dans l'ordre du rendu
+    complet, toutes les cellules qui recouvrent cette boîte : ses voisines pour les
+    bords partagés et, pour de très petits hexagones, des cellules plus éloignées)
+    et retourne les zones modifiées. Le coût d'une modification
+    dépend du nombre de cellules changées, pas de la taille de la grille, et
+    l'image reste identique pixel à pixel à un rendu complet.
+
+    Args:
+        layout: Le layout de la grille.
+        image_size: La taille (largeur, hauteur) de l'image.
+        cells: Les couleurs initiales des cellules (l'ordre définit l'ordre de dessin).
+        background: La couleur de fond.
+    """
+
+    def __init__(
+        self,
+        layout: HexgridLayout,
+        image_size: tuple[int, int],
+        cells: Mapping[AxialPos, ProtocolColor] | None = None,
+        background: ProtocolColor = ProtocolColor.WHITE
+    ) -> None:
+        self.layout = layout
+        self.background = background
+        self.cells: dict[AxialPos, ProtocolColor] = dict(cells or {})
+        self._order: dict[AxialPos, int] = {pos: i for i, pos in enumerate(self.cells)}
+        self._dirty: set[AxialPos] = set()
+        # Décalages des cellules dont la boîte peut recouvrir celle d'une cellule : les centres
+        # de deux cellules à distance d sont à au moins 1.5 * d * size, et chaque boîte déborde
+        # de l'hexagone d'au plus 2 pixels
+        reach = math.ceil((2 * layout.size + 4) / (1.5 * layout.size))
+        self._offsets: list[tuple[int, int]] = [
+            (dq, dr)
+            for dq in range(-reach, reach + 1)
+            for dr in range(-reach, reach + 1)
+            if max(abs(dq), abs(dr), abs(dq + dr)) <= reach
+        ]
+        self.image: Image.Image = render_cells(layout, self.cells, image_size, background)
+        # Image de travail de même taille, allouée une seule fois
+        self._scratch: Image.Image = self.image.copy()
+        self._scratch_draw = ImageDraw.Draw(self._scratch)
+
+    def cell_box(self, pos: AxialPos) -> PixelBox:
+        """Boîte englobante (en pixels entiers, contour compris) d'une cellule, limitée à l'image."""
+        vertices = self.layout.get_hexagon_vertices(pos)
+        width, height = self.image.size
+        return (
+            max(math.floor(min(v.x for v in vertices)) - 1, 0),
+            max(math.floor(min(v.y for v in vertices)) - 1, 0),
+            min(math.ceil(max(v.x for v in vertices)) + 2, width),
+            min(math.ceil(max(v.y for v in vertices)) + 2, height),
+        )
+
+    def set_cell(self, pos: AxialPos, color: ProtocolColor) -> None:
+        """Change la couleur d'une cellule (ajoutée à la fin de l'ordre de dessin si nouvelle)."""
+        if self.cells.get(pos) is color:
+            return
+        if pos not in self._order:
+            self._order[pos] = len(self._order)
+        self.cells[pos] = color
+        self._dirty.add(pos)
+
+    def update(self, cells: Mapping[AxialPos, ProtocolColor]) -> None:
+        """Change la couleur de plusieurs cellules."""
+        for pos, color in cells.items():
+            self.set_cell(pos, color)
+
+    @property
+    def dirty(self) -> frozenset[AxialPos]:
+        """Les cellules modifiées depuis le dernier `flush`."""
+        return frozenset(self._dirty)
+
+    def flush(self) -> list[PixelBox]:
+        """Repeint les cellules modifiées et retourne les zones de l'image qui ont changé."""
+        regions: list[PixelBox] = []
+        for pos in sorted(self._dirty, key=self._order.__getitem__):
+            box = self.cell_box(pos)
+            if box[0] >= box[2] or box[1] >= box[3]:
+                continue  # Cellule hors de l'image
+            self._repaint(box, pos)
+            regions.append(box)
+        self._dirty.clear()
+        return regions
+
+    def _repaint(self, box: PixelBox, pos: AxialPos) -> None:
+        # Dessin aux coordonnées absolues (rastérisation identique au rendu complet) sur
+        # l'image de travail, dont seule la boîte est ensuite recopiée dans l'image
+        self._scratch_draw.rectangle((box[0], box[1], box[2] - 1, box[3] - 1), fill=self.background.rgb)
+        nearby = (AxialPos(pos.q + dq, pos.r + dr) for dq, dr in self._offsets)
+        overlapping = [cell_pos for cell_pos in nearby
+                       if cell_pos in self.cells and _intersects(self.cell_box(cell_pos), box)]
+        for cell_pos in sorted(overlapping, key=self._order.__getitem__):
+            draw_hexagon(self._scratch_draw, Hexagon(pos=cell_pos, layout=self.layout), fill_color=self.cells[cell_pos])
+        self.image.paste(self._scratch.crop(box), box[:2])
+
+
+def _intersects(a: PixelBox, b: PixelBox) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
@@ -0,0 +1,132 @@
+from functools import lru_cache
+from typing import Final, Iterable, Mapping
+import math
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Imports relatifs car scaled_render.py est dans core/
+from .hex_grid import AxialPos, HexgridLayout, PixelCoord
+from .constants import ProtocolColor
+from .structure import build_structure_layer, build_data_path, build_layout
+from .geometry_cache import default_cache
+
+# Étiquettes réservées de l'image d'étiquettes ; la cellule i porte l'étiquette FIRST_CELL_LABEL + i
+BACKGROUND_LABEL: Final[int] = 0
+OUTLINE_LABEL: Final[int] = 1
+FIRST_CELL_LABEL: Final[int] = 2
+
+
+def draw_order(version: str) -> tuple[AxialPos, ...]:
+    """Ordre de dessin des cellules : celui de `HexagonalEncoder.encode_cells` (repères, puis chemin de données)."""
+    return tuple(build_structure_layer(version)) + build_data_path(version)
+
+
+@lru_cache(maxsize=8)
+def build_label_image(version: str, hex_size: float, quiet_zone: float) -> tuple[np.ndarray, np.ndarray]:
+    """Rastérise la grille une seule fois, en étiquettes de cellules plutôt qu'en couleurs.
+
+    La rastérisation est celle de `render_cells` (mêmes polygones, même ordre),
+    à une différence près : Pillow ne trace pas le contour d'une cellule noire
+    (remplissage et contour de même couleur), alors que l'image d'étiquettes,
+    indépendante du message, trace tous les contours. L'image est conservée
+    dans le cache sur disque (`default_cache`).
+
+    Returns:
+        L'image d'étiquettes (hauteur, largeur) et, pour chaque cellule de
+        `draw_order`, le pixel (x, y) de son centre. Tableaux en lecture seule.
+
+    Raises:
+        ValueError: Si `hex_size` est trop petit pour que le centre de chaque cellule garde sa couleur.
+    """
+    layout, _ = build_layout(version, hex_size, quiet_zone)
+    centers = np.array([(math.floor(c.x), math.floor(c.y))
+                        for c in (PixelCoord.from_axial(pos, layout) for pos in draw_order(version))], dtype=np.intp)
+    centers.flags.writeable = False
+    labels = default_cache().load_or_build("labels", (version, hex_size, quiet_zone),
+                                           lambda: _rasterize_labels(version, hex_size, quiet_zone, centers))
+    return labels, centers
+
+
+def _rasterize_labels(version: str, hex_size: float, quiet_zone: float, centers: np.ndarray) -> np.ndarray:
+    layout, image_size = build_layout(version, hex_size, quiet_zone)
+    order = draw_order(version)
+    # Mode "I" : étiquettes entières sur 32 bits (plus de 256 cellules)
+    image = Image.new("I", image_size, BACKGROUND_LABEL)
+    draw = ImageDraw.Draw(image)
+    for label, pos in enumerate(order, start=FIRST_CELL_LABEL):
+        draw.polygon([(v.x, v.y) for v in layout.get_hexagon_vertices(pos)], fill=label, outline=OUTLINE_LABEL)
+    labels = np.asarray(image, dtype=np.uint16)
+
+    expected = np.arange(FIRST_CELL_LABEL, FIRST_CELL_LABEL + len(order))
+    if not np.array_equal(labels[centers[:, 1], centers[:, 0]], expected):
+        raise ValueError(f"hex_size trop petit pour un rendu sans perte : {hex_size}")
+    return labels
+
+
+class ScaledRenderer:
+    """Rendu d'une même grille à plusieurs tailles, par réplication entière d'un rendu canonique.
+
+    La géométrie (polygones, contours) n'est rastérisée qu'une fois, à la taille
+    canonique `hex_size`, sous forme d'une image d'étiquettes partagée par tous
+    les messages. Le rendu à l'échelle k est une indexation de palette suivie
+    d'une réplication de chaque pixel en un bloc k x k : son coût est celui
+    d'une copie mémoire de l'image finale, quelle que soit la taille demandée.
+
+    Args:
+        version: La version du protocole.
+        hex_size: La taille canonique des hexagones, en pixels (échelle 1).
+        quiet_zone: La marge autour de la grille, en nombre de `hex_size`.
+        background: La couleur de fond.
+    """
+
+    def __init__(
+        self,
+        version: str = "1",
+        hex_size: float = 10.0,
+        quiet_zone: float = 2.0,
+        background: ProtocolColor = ProtocolColor.WHITE
+    ) -> None:
+        self.version = version
+        self.hex_size = hex_size
+        self.background = background
+        self.order: tuple[AxialPos, ...] = draw_order(version)
+        self.layout: HexgridLayout
+        self.image_size: tuple[int, int]
+        self.layout, self.image_size = build_layout(version, hex_size, quiet_zone)
+        self.labels, self.centers = build_label_image(version, hex_size, quiet_zone)
+
+    def layout_for(self, scale: int) -> HexgridLayout:
+        """Le layout équivalent à l'échelle `scale` (un pixel canonique devient un bloc scale x scale)."""
+        origin = self.layout.origin
+        return HexgridLayout(size=self.hex_size * scale, origin=PixelCoord(origin.x * scale, origin.y * scale))
+
+    def palette(self, cells: Mapping[AxialPos, ProtocolColor]) -> np.ndarray:
+        """Couleur RVB de chaque étiquette, forme (étiquettes, 3)."""
+        colors = [self.background.rgb, ProtocolColor.BLACK.rgb] + [cells[pos].rgb for pos in self.order]
+        return np.array(colors, dtype=np.uint8)
+
+    def render(self, cells: Mapping[AxialPos, ProtocolColor], scale: int = 1) -> Image.Image:
+        """Rend la grille à l'échelle entière `scale` (image `scale` fois plus grande que l'image canonique)."""
+        return self.render_many(cells, (scale,))[0]
+
+    def render_many(self, cells: Mapping[AxialPos, ProtocolColor], scales: Iterable[int]) -> list[Image.Image]:
+        """Rend la grille à plusieurs échelles entières ; la palette n'est appliquée qu'une fois."""
+        base = Image.fromarray(self.palette(cells)[self.labels], "RGB")
+        width, height = self.image_size
+        images: list[Image.Image] = []
+        for scale in scales:
+            if not isinstance(scale, int) or scale < 1:
+                raise ValueError(f"Échelle invalide : {scale} (entier strictement positif attendu)")
+            # Avec un facteur entier, l'interpolation "plus proche voisin" est une réplication exacte
+            images.append(base.copy() if scale == 1 else base.resize((width * scale, height * scale), Image.NEAREST))
+        return images
+
+    def check(self, image: Image.Image, cells: Mapping[AxialPos, ProtocolColor], scale: int) -> bool:
+        """Vérifie sans perte que le centre de chaque cellule a gardé sa couleur à l'échelle `scale`."""
+        if image.size != (self.image_size[0] * scale, self.image_size[1] * scale):
+            return False
+        pixels = np.asarray(image.convert("RGB"))
+        samples = self.centers * scale + scale // 2
+        expected = self.palette(cells)[FIRST_CELL_LABEL:]
+        return bool(np.array_equal(pixels[samples[:, 1], samples[:, 0]], expected))
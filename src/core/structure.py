@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Final, Literal, Mapping
+import math
+
+# Imports relatifs car structure.py est dans core/
+from .hex_grid import AxialPos, HexgridLayout, PixelCoord, Hexagon
+from .constants import (
+    ProtocolColor, FINDER_COLORS, GRID_RADIUS_REF,
+    FINDER_POS_TL, FINDER_POS_TR, FINDER_POS_BL,
+)
+
+FinderType = Literal["origin", "xaxis", "yaxis"]
+
+
+@dataclass(frozen=True)
+class ProtocolVersion:
+    """Décrit une version (taille) du protocole.
+
+    Attributs:
+        radius: Les coordonnées q et r de la grille varient de -radius à +radius.
+        finders: Les repères d'alignement de la version, sous la forme (type, centre).
+    """
+    radius: int
+    finders: tuple[tuple[FinderType, AxialPos], ...]
+
+
+# Versions connues du protocole. Seule la grille de référence existe pour l'instant.
+PROTOCOL_VERSIONS: Final[dict[str, ProtocolVersion]] = {
+    "1": ProtocolVersion(
+        radius=GRID_RADIUS_REF,
+        finders=(("origin", FINDER_POS_TL), ("xaxis", FINDER_POS_TR), ("yaxis", FINDER_POS_BL)),
+    ),
+}
+
+
+class CellRole(Enum):
+    """Rôle d'une cellule dans la matrice."""
+    FINDER = "finder"
+    DATA = "data"
+
+
+def get_version(version: str) -> ProtocolVersion:
+    """Retourne la description d'une version, ou lève une ValueError si elle est inconnue."""
+    try:
+        return PROTOCOL_VERSIONS[version]
+    except KeyError:
+        raise ValueError(f"Version de protocole inconnue : {version!r}") from None
+
+
+@lru_cache(maxsize=None)
+def grid_positions(version: str) -> tuple[AxialPos, ...]:
+    """Retourne toutes les positions de la grille, q puis r croissants."""
+    radius = get_version(version).radius
+    return tuple(
+        AxialPos(q, r)
+        for q in range(-radius, radius + 1)
+        for r in range(-radius, radius + 1)
+    )
+
+
+@lru_cache(maxsize=None)
+def build_structure_layer(version: str) -> Mapping[AxialPos, ProtocolColor]:
+    """Retourne les couleurs fixes des éléments de structure (repères d'alignement)."""
+    # Layout arbitraire : seul le voisinage logique est utilisé ici
+    neighbor_layout = HexgridLayout(size=1.0, origin=PixelCoord(0, 0))
+    layer: dict[AxialPos, ProtocolColor] = {}
+    for pattern_type, center_pos in get_version(version).finders:
+        colors = FINDER_COLORS[pattern_type]
+        layer[center_pos] = colors["center"]
+        for neighbor in Hexagon(pos=center_pos, layout=neighbor_layout).get_neighbors():
+            layer[neighbor.pos] = colors["ring"]
+    return MappingProxyType(layer)
+
+
+@lru_cache(maxsize=None)
+def build_role_map(version: str) -> Mapping[AxialPos, CellRole]:
+    """Associe chaque position de la grille à son rôle."""
+    structure = build_structure_layer(version)
+    return MappingProxyType({
+        pos: CellRole.FINDER if pos in structure else CellRole.DATA
+        for pos in grid_positions(version)
+    })
+
+
+@lru_cache(maxsize=None)
+def build_data_path(version: str) -> tuple[AxialPos, ...]:
+    """Retourne le chemin de lecture/écriture des cellules de données (Plan §1.8).
+
+    Parcours en serpentin : itération sur q, puis sur r en inversant le sens
+    à chaque nouvelle valeur de q.
+    """
+    radius = get_version(version).radius
+    role_map = build_role_map(version)
+    path: list[AxialPos] = []
+    for index, q in enumerate(range(-radius, radius + 1)):
+        r_values = range(-radius, radius + 1)
+        if index % 2 == 1:
+            r_values = reversed(r_values)
+        path.extend(
+            AxialPos(q, r) for r in r_values
+            if role_map[AxialPos(q, r)] is CellRole.DATA
+        )
+    return tuple(path)
+
+
+def build_layout(version: str, hex_size: float, quiet_zone: float) -> tuple[HexgridLayout, tuple[int, int]]:
+    """Calcule le layout et la taille d'image pour dessiner une grille complète.
+
+    Args:
+        version: La version du protocole.
+        hex_size: La distance centre-sommet des hexagones, en pixels.
+        quiet_zone: La marge autour de la grille, en nombre de `hex_size`.
+
+    Returns:
+        Le layout (origine placée pour que la grille soit entièrement visible)
+        et la taille (largeur, hauteur) de l'image.
+    """
+    radius = get_version(version).radius
+    # Étendue de la grille en "losange" pour un layout de taille 1 centré en (0,0)
+    half_width = 1.5 * radius + 1
+    half_height = 1.5 * math.sqrt(3) * radius + math.sqrt(3) / 2
+    margin = quiet_zone * hex_size
+    width = math.ceil(2 * (half_width * hex_size + margin))
+    height = math.ceil(2 * (half_height * hex_size + margin))
+    layout = HexgridLayout(size=hex_size, origin=PixelCoord(width / 2, height / 2))
+    return layout, (width, height)
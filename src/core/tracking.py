@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+import math
+
+import numpy as np
+from PIL import Image
+
+# Imports relatifs car tracking.py est dans core/
+from .consensus import ConsensusScores
+from .decoder import (
+    HexagonalDecoder, CellReading, DecodeError, FinderCandidate,
+    find_finder_candidates, fit_affine, apply_affine, to_rgb_array,
+)
+
+Frame = Image.Image | np.ndarray
+
+
+@dataclass(frozen=True)
+class FrameResult:
+    """Résultat du traitement d'une image de la séquence.
+
+    Attributs:
+        message: Le message reconstruit à partir des lectures accumulées, ou None.
+        tracked: True si les repères ont été retrouvés par suivi (fenêtres locales),
+            False s'il a fallu une détection complète (ou si la grille est perdue).
+        reading: La lecture des cellules de cette image, ou None si la grille est introuvable.
+    """
+    message: str | None
+    tracked: bool
+    reading: CellReading | None
+
+
+class SequenceDecoder:
+    """Décode une séquence d'images (flux vidéo) en suivant la grille d'une image à l'autre.
+
+    La recherche des repères de chaque image est limitée à de petites fenêtres
+    autour des positions prédites par la transformation précédente ; la détection
+    complète n'est utilisée qu'au démarrage ou lorsque le suivi est perdu.
+    Les probabilités de couleur de chaque cellule sont cumulées d'une image à
+    l'autre, pondérées par leur cohérence avec les cellules voisines, ce qui
+    permet de reconstruire un message à partir de lectures partielles
+    (occultations, reflets, grille en partie hors champ). Elles sont conservées
+    lorsque la grille est perdue un instant, et oubliées dès qu'une lecture
+    complète (sans effacement) montre un autre message : un autre code présenté
+    au même endroit. L'oubli progressif (`decay`) borne aussi l'influence des
+    lectures anciennes lorsqu'aucune lecture n'est complète.
+
+    Args:
+        version: La version du protocole.
+        search_margin: Le déplacement maximal suivi entre deux images, en tailles d'hexagone.
+        decay: Le facteur d'oubli appliqué aux lectures passées à chaque image (1.0 : aucun oubli).
+    """
+
+    def __init__(self, version: str = "1", search_margin: float = 2.0, decay: float = 0.9) -> None:
+        if not 0.0 < decay <= 1.0:
+            raise ValueError(f"decay doit être dans ]0, 1] : {decay}")
+        self.decoder = HexagonalDecoder(version)
+        self.search_margin = search_margin
+        self.decay = decay
+        self.transform: np.ndarray | None = None
+        self.evidence: np.ndarray = np.zeros((len(self.decoder.tables.positions), 4))
+
+    def reset(self) -> None:
+        """Oublie la position de la grille et les lectures accumulées (nouveau code)."""
+        self.transform = None
+        self.evidence[:] = 0.0
+
+    def _track(self, pixels: np.ndarray) -> np.ndarray | None:
+        """Cherche les repères autour des positions prédites. Retourne None si le suivi est perdu."""
+        assert self.transform is not None
+        height, width = pixels.shape[:2]
+        cell_size = math.sqrt(abs(np.linalg.det(self.transform[:, :2])))
+        # L'anneau d'un repère s'étend jusqu'à ~2.6 tailles d'hexagone de son centre
+        half = math.ceil((2.6 + self.search_margin) * cell_size)
+        candidates: list[FinderCandidate] = []
+        for x, y in apply_affine(self.transform, self.decoder.tables.finder_centers):
+            x0, y0 = max(int(x) - half, 0), max(int(y) - half, 0)
+            x1, y1 = min(int(x) + half, width), min(int(y) + half, height)
+            if x1 <= x0 or y1 <= y0:
+                return None
+            window = self.decoder.classify(pixels[y0:y1, x0:x1])
+            for candidate in find_finder_candidates(window):
+                cx, cy = candidate.center
+                candidates.append(FinderCandidate((cx + x0, cy + y0), candidate.size, candidate.ring, candidate.score))
+        try:
+            found = self.decoder.match_finders(candidates)
+        except DecodeError:
+            return None
+        return fit_affine(self.decoder.tables.finder_centers, found)
+
+    def _replaced(self, reading: CellReading, scores: ConsensusScores) -> bool:
+        """Indique si une lecture complète (sans effacement) montre un autre message que les lectures accumulées."""
+        if not self.evidence.any() or len(self.decoder.data_erasures(scores)) > 0:
+            return False
+        try:
+            return self.decoder.decode_symbols(reading.symbols) != self.message()
+        except DecodeError:
+            return False
+
+    def process(self, frame: Frame) -> FrameResult:
+        """Traite une image de la séquence (image Pillow ou tableau RVB (hauteur, largeur, 3))."""
+        pixels = frame if isinstance(frame, np.ndarray) else to_rgb_array(frame)
+        transform = self._track(pixels) if self.transform is not None else None
+        tracked = transform is not None
+        if transform is None:
+            try:
+                transform = self.decoder.locate(self.decoder.classify(pixels))
+            except DecodeError:
+                self.transform = None
+                return FrameResult(message=self.message(), tracked=False, reading=None)
+
+        self.transform = transform
+        reading = self.decoder.read_cells(pixels, transform)
+        scores = self.decoder.consensus(reading)
+        if self._replaced(reading, scores):
+            # Autre code (même à la même position) : les lectures accumulées ne le concernent pas
+            self.evidence[:] = 0.0
+        self.evidence *= self.decay
+        # Les lectures incohérentes avec leur voisinage (reflets, taches) comptent peu
+        self.evidence += reading.probabilities * scores.weights[:, None]
+        return FrameResult(message=self.message(), tracked=tracked, reading=reading)
+
+    def message(self) -> str | None:
+        """Le message reconstruit à partir des lectures accumulées, ou None s'il est illisible."""
+        if not self.evidence.any():
+            return None
+        try:
+            return self.decoder.decode_symbols(self.evidence.argmax(axis=1))
+        except DecodeError:
+            return None
@@ -0,0 +1,3 @@
+from .degradations import DegradationSpec, degrade
+
+__all__ = ["DegradationSpec", "degrade"]
@@ -0,0 +1,132 @@
+"""Génération parallèle de corpus de robustesse (Plan §6.2).
+
+Usage :
+    python -m src.robustness.corpus sortie/ --count 10000 --seed 42
+
+Chaque fragment `shard-XXXXX` du répertoire de sortie contient :
+    .npy   Les images dégradées, forme (n, hauteur, largeur, 3) uint8.
+    .hxgc  Les grilles de référence (corpus `GridCorpus`), dans le même ordre.
+    .json  Pour chaque image : index, message et paramètres de dégradation tirés.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import json
+import os
+import string
+import time
+
+import numpy as np
+
+from ..core.batch import fork_context
+from ..core.encoder import HexagonalEncoder
+from ..core.grid_state import GridState, GridCorpusWriter
+from .degradations import DegradationSpec, degrade
+
+_ALPHABET = np.array(list(string.ascii_letters + string.digits + " .,!?-"))
+
+
+@dataclass(frozen=True)
+class CorpusReport:
+    """Bilan d'une génération de corpus."""
+    images: int
+    shards: int
+    seconds: float
+
+    @property
+    def images_per_second(self) -> float:
+        return self.images / self.seconds if self.seconds > 0 else float("inf")
+
+
+def item_rng(seed: int, index: int) -> np.random.Generator:
+    """Générateur propre à une image : le résultat ne dépend ni des workers ni des fragments."""
+    return np.random.default_rng([seed, index])
+
+
+def _generate_shard(output_dir: Path, shard: int, start: int, count: int, seed: int,
+                    spec: DegradationSpec, version: str, hex_size: float) -> int:
+    """Génère et écrit un fragment complet. Retourne le nombre d'images écrites.
+
+    Chaque image est ajoutée au fichier `.npy` dès qu'elle est produite : la mémoire
+    d'un worker est celle d'une image, pas d'un fragment. Les trois fichiers sont
+    écrits sous un nom temporaire (`.part`) et ne prennent leur nom définitif
+    qu'une fois le fragment complet ; une génération interrompue ne laisse que
+    des fichiers `.part`, supprimés si l'interruption est une exception.
+    """
+    encoder = HexagonalEncoder(version=version, hex_size=hex_size)
+    records = []
+    stem = output_dir / f"shard-{shard:05d}"
+    partials = {suffix: stem.with_suffix(suffix + ".part") for suffix in (".npy", ".hxgc", ".json")}
+    shape = (count, spec.canvas_size[1], spec.canvas_size[0], 3)
+    try:
+        with open(partials[".npy"], "wb") as images, GridCorpusWriter(partials[".hxgc"]) as grids:
+            np.lib.format.write_array_header_1_0(images, {"descr": "|u1", "fortran_order": False, "shape": shape})
+            for offset in range(count):
+                index = start + offset
+                rng = item_rng(seed, index)
+                length = int(rng.integers(1, encoder.capacity + 1))
+                message = "".join(rng.choice(_ALPHABET, size=length))
+                cells = encoder.encode_cells(message)
+                image, params = degrade(encoder.encode(message), rng, spec)
+                images.write(np.ascontiguousarray(image, dtype=np.uint8).tobytes())
+                grids.write(GridState.from_cells(version, cells))
+                records.append({"index": index, "message": message, "params": params})
+        partials[".json"].write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    except BaseException:
+        for partial in partials.values():
+            partial.unlink(missing_ok=True)
+        raise
+    for suffix, partial in partials.items():
+        os.replace(partial, stem.with_suffix(suffix))
+    return count
+
+
+def generate_corpus(
+    output_dir: str | Path,
+    count: int,
+    seed: int = 0,
+    spec: DegradationSpec = DegradationSpec(),
+    shard_size: int = 256,
+    workers: int | None = None,
+    version: str = "1",
+    hex_size: float = 6.0
+) -> CorpusReport:
+    """Génère `count` paires (image dégradée, grille de référence) dans des fragments sur disque.
+
+    Les fragments sont produits en parallèle et écrits directement par les workers.
+    Le contenu ne dépend que de `seed` (et des paramètres), pas du nombre de workers.
+    """
+    if count < 0 or shard_size < 1:
+        raise ValueError(f"Paramètres invalides : count={count}, shard_size={shard_size}")
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    jobs = [(output, shard, start, min(shard_size, count - start), seed, spec, version, hex_size)
+            for shard, start in enumerate(range(0, count, shard_size))]
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if workers == 1:
+        images = sum(_generate_shard(*job) for job in jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=fork_context()) as pool:
+            images = sum(pool.map(_generate_shard, *zip(*jobs))) if jobs else 0
+    return CorpusReport(images=images, shards=len(jobs), seconds=time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Génère un corpus d'images dégradées pour les tests de robustesse.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--hex-size", type=float, default=6.0)
+    args = parser.parse_args()
+    report = generate_corpus(args.output_dir, args.count, seed=args.seed, shard_size=args.shard_size,
+                             workers=args.workers, hex_size=args.hex_size)
+    print(f"{report.images} images en {report.shards} fragments, {report.seconds:.1f} s "
+          f"({report.images_per_second:.1f} images/s)")
+
+
+if __name__ == "__main__":
+    main()
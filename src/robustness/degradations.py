@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from statistics import NormalDist
+import io
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+FloatRange = tuple[float, float]
+
+
+@dataclass(frozen=True)
+class DegradationSpec:
+    """Plages des dégradations appliquées aux images (Plan §6.2).
+
+    Chaque paramètre est tiré uniformément dans sa plage ; une plage (0, 0)
+    désactive la dégradation correspondante.
+
+    Attributs:
+        canvas_size: La taille (largeur, hauteur) des images produites.
+        rotation: L'angle de rotation, en degrés.
+        scale: Le facteur de mise à l'échelle.
+        perspective: Le déplacement aléatoire des coins, en fraction de la taille du code.
+        gain: Le gain de luminosité (sur/sous-exposition).
+        color_shift: L'écart maximal du gain par canal (température de couleur).
+        blur_sigma: L'écart-type du flou gaussien, en pixels.
+        noise_std: L'écart-type du bruit de capteur, en niveaux (0-255).
+        occlusion: La fraction maximale de la surface du code masquée par un rectangle.
+        jpeg_quality: La qualité JPEG (0 : pas de compression).
+    """
+    canvas_size: tuple[int, int] = (640, 640)
+    rotation: FloatRange = (-45.0, 45.0)
+    scale: FloatRange = (0.6, 1.6)
+    perspective: FloatRange = (0.0, 0.08)
+    gain: FloatRange = (0.7, 1.2)
+    color_shift: FloatRange = (0.0, 0.1)
+    blur_sigma: FloatRange = (0.0, 1.2)
+    noise_std: FloatRange = (0.0, 10.0)
+    occlusion: FloatRange = (0.0, 0.03)
+    jpeg_quality: FloatRange = (40.0, 95.0)
+
+
+@lru_cache(maxsize=None)
+def _normal_quantiles() -> np.ndarray:
+    """Quantiles de la loi normale centrée réduite sur 16 bits (table de 65536 valeurs)."""
+    inv_cdf = NormalDist().inv_cdf
+    return np.array([inv_cdf((i + 0.5) / (1 << 16)) for i in range(1 << 16)], dtype=np.float32)
+
+
+def _homography(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Coefficients (8,) de l'homographie envoyant 4 points `source` sur `target`."""
+    rows = []
+    for (x, y), (u, v) in zip(source, target):
+        rows.append([x, y, 1, 0, 0, 0, -u * x, -u * y])
+        rows.append([0, 0, 0, x, y, 1, -v * x, -v * y])
+    return np.linalg.solve(np.array(rows, dtype=np.float64), target.reshape(-1))
+
+
+def degrade(image: Image.Image, rng: np.random.Generator, spec: DegradationSpec = DegradationSpec()) -> tuple[np.ndarray, dict[str, float]]:
+    """Applique une combinaison aléatoire (mais reproductible) de dégradations.
+
+    Args:
+        image: L'image RGB du code à dégrader.
+        rng: Le générateur aléatoire (seul source d'aléa : même graine, même résultat).
+        spec: Les plages des dégradations.
+
+    Returns:
+        L'image dégradée (tableau (hauteur, largeur, 3) uint8 de taille `spec.canvas_size`)
+        et les paramètres tirés.
+    """
+    def draw(value_range: FloatRange) -> float:
+        return float(rng.uniform(*value_range))
+
+    params = {name: draw(getattr(spec, name)) for name in (
+        "rotation", "scale", "perspective", "gain", "color_shift", "blur_sigma", "noise_std", "occlusion", "jpeg_quality")}
+    canvas_w, canvas_h = spec.canvas_size
+    width, height = image.size
+
+    # --- Géométrie : rotation, échelle, perspective et translation en une seule homographie ---
+    corners = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float64)
+    angle = np.radians(params["rotation"])
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+    placed = (corners - (width / 2, height / 2)) @ rotation.T * params["scale"]
+    placed += rng.uniform(-1, 1, size=(4, 2)) * params["perspective"] * max(width, height) * params["scale"]
+    extent = placed.max(axis=0) - placed.min(axis=0)
+    # Translation aléatoire gardant le code dans l'image quand c'est possible
+    slack = np.maximum(np.array([canvas_w, canvas_h]) - extent, 0)
+    offset = rng.uniform(0, 1, size=2) * slack + np.minimum(np.array([canvas_w, canvas_h]) - extent, 0) / 2
+    placed += offset - placed.min(axis=0)
+    background = int(rng.integers(90, 230))
+    warped = image.convert("RGB").transform(
+        spec.canvas_size, Image.PERSPECTIVE, tuple(_homography(placed, corners)),
+        resample=Image.BILINEAR, fillcolor=(background,) * 3)
+
+    # --- Optique : flou ---
+    if params["blur_sigma"] > 0:
+        warped = warped.filter(ImageFilter.GaussianBlur(params["blur_sigma"]))
+
+    # --- Couleur et bruit, vectorisés ---
+    pixels = np.asarray(warped, dtype=np.float32)  # Copie : les opérations suivantes sont en place
+    channel_gain = params["gain"] * (1 + rng.uniform(-1, 1, size=3) * params["color_shift"])
+    pixels *= channel_gain.astype(np.float32)
+    if params["noise_std"] > 0:
+        # Tirage par table de quantiles : ~4 fois plus rapide que rng.standard_normal
+        noise = _normal_quantiles()[rng.integers(0, 1 << 16, size=pixels.shape, dtype=np.uint16)]
+        noise *= params["noise_std"]
+        pixels += noise
+
+    # --- Occlusion : un rectangle de couleur aléatoire sur le code ---
+    if params["occlusion"] > 0:
+        area = params["occlusion"] * extent[0] * extent[1]
+        aspect = rng.uniform(0.3, 3.0)
+        occ_w, occ_h = max(int(np.sqrt(area * aspect)), 1), max(int(np.sqrt(area / aspect)), 1)
+        x0 = int(rng.uniform(placed[:, 0].min(), max(placed[:, 0].max() - occ_w, placed[:, 0].min())))
+        y0 = int(rng.uniform(placed[:, 1].min(), max(placed[:, 1].max() - occ_h, placed[:, 1].min())))
+        pixels[max(y0, 0):max(y0 + occ_h, 0), max(x0, 0):max(x0 + occ_w, 0)] = rng.integers(0, 256, size=3)
+
+    np.clip(pixels, 0, 255, out=pixels)
+    result = pixels.astype(np.uint8)
+
+    # --- Compression JPEG ---
+    if params["jpeg_quality"] > 0:
+        buffer = io.BytesIO()
+        Image.fromarray(result).save(buffer, format="JPEG", quality=int(params["jpeg_quality"]))
+        buffer.seek(0)
+        result = np.asarray(Image.open(buffer).convert("RGB"))
+    return result, params
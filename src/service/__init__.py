@@ -0,0 +1,4 @@
+from .server import DecodeService, ServiceBusy
+from .client import post_image, fetch_metrics
+
+__all__ = ["DecodeService", "ServiceBusy", "post_image", "fetch_metrics"]
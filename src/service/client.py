@@ -0,0 +1,40 @@
+from http.client import HTTPConnection
+from io import BytesIO
+import json
+
+from PIL import Image
+
+
+def post_image(host: str, port: int, image: Image.Image | bytes, timeout: float = 10.0) -> tuple[int, dict[str, str]]:
+    """Envoie une image au service de décodage local.
+
+    Args:
+        host: L'adresse du service.
+        port: Le port du service.
+        image: Une image Pillow (envoyée en PNG) ou des octets d'image déjà encodés.
+        timeout: Le délai maximal de la requête, en secondes.
+
+    Returns:
+        Le statut HTTP et la réponse JSON ({"text": ...} ou {"error": ...}).
+    """
+    if isinstance(image, Image.Image):
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        image = buffer.getvalue()
+    connection = HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("POST", "/decode", body=image, headers={"Content-Type": "application/octet-stream"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def fetch_metrics(host: str, port: int, timeout: float = 10.0) -> str:
+    """Récupère les compteurs du service au format texte Prometheus."""
+    connection = HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("GET", "/metrics")
+        return connection.getresponse().read().decode("utf-8")
+    finally:
+        connection.close()
@@ -0,0 +1,89 @@
+from bisect import bisect_left
+from typing import Final
+
+# Bornes (en secondes) de l'histogramme de latence
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Counter:
+    """Compteur monotone, éventuellement décliné par une étiquette."""
+
+    def __init__(self, name: str, help_text: str, label: str | None = None) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.values: dict[str, float] = {}
+
+    def inc(self, label_value: str = "", amount: float = 1.0) -> None:
+        self.values[label_value] = self.values.get(label_value, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_value, value in sorted(self.values.items()):
+            labels = f'{{{self.label}="{label_value}"}}' if self.label else ""
+            lines.append(f"{self.name}{labels} {value:g}")
+        return lines
+
+
+class Gauge:
+    """Valeur instantanée (ex: nombre de requêtes en cours)."""
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {self.value:g}"]
+
+
+class Histogram:
+    """Histogramme cumulatif au format Prometheus."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative}')
+        lines.append(f"{self.name}_sum {self.total:g}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+class ServiceMetrics:
+    """Métriques exposées par le service de décodage sur `/metrics`.
+
+    Le débit s'obtient côté Prometheus avec `rate(decode_requests_total[1m])`.
+    """
+
+    def __init__(self) -> None:
+        self.requests = Counter("decode_requests_total", "Requêtes de décodage par statut.", label="status")
+        self.latency = Histogram("decode_request_duration_seconds", "Durée de traitement des requêtes de décodage.")
+        self.in_flight = Gauge("decode_requests_in_flight", "Requêtes de décodage admises et non terminées.")
+        self.decoded_bytes = Counter("decode_message_bytes_total", "Octets de message décodés.")
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in (self.requests, self.latency, self.in_flight, self.decoded_bytes):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,278 @@
+"""Service local de décodage : front-end HTTP asyncio, décodage dans un pool de processus.
+
+Usage :
+    python -m src.service.server --port 8080
+
+Routes :
+    POST /decode   Corps = image (PNG, JPEG...). Réponse JSON {"text": ...}.
+    GET  /metrics  Compteurs au format texte Prometheus.
+    GET  /health   Réponse JSON {"status": "ok"}.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Callable, Final
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from PIL import Image, UnidentifiedImageError
+
+from ..core.batch import fork_context
+from ..core.decoder import HexagonalDecoder, DecodeError
+from .metrics import ServiceMetrics
+
+MAX_BODY_BYTES: Final[int] = 16 * 1024 * 1024
+# Taille maximale (largeur x hauteur) d'une image décodée : vérifiée avant la décompression
+MAX_IMAGE_PIXELS: Final[int] = 40_000_000
+HTTP_REASONS: Final[dict[int, str]] = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+    503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+# Décodeur du processus courant, construit par le parent (voir `fork_context`) ; avec
+# "spawn", les workers projettent en mémoire les tables du cache sur disque.
+_worker_decoder: HexagonalDecoder | None = None
+
+
+def _init_worker(version: str) -> None:
+    """Initialise le décodeur d'un worker, une seule fois par processus."""
+    global _worker_decoder
+    if _worker_decoder is None or _worker_decoder.version != version:
+        _worker_decoder = HexagonalDecoder(version)
+
+
+def _decode_image_bytes(data: bytes) -> str:
+    """Décode une image encodée (PNG, JPEG...) avec le décodeur du worker."""
+    assert _worker_decoder is not None, "Worker non initialisé"
+    try:
+        image = Image.open(BytesIO(data))
+        width, height = image.size
+        if width * height > MAX_IMAGE_PIXELS:
+            raise DecodeError(f"Image trop grande : {width}x{height} pixels (au plus {MAX_IMAGE_PIXELS})")
+        image.load()
+    except Image.DecompressionBombError as error:
+        raise DecodeError(f"Image trop grande : {error}") from None
+    except (UnidentifiedImageError, OSError) as error:
+        raise DecodeError(f"Image illisible : {error}") from None
+    return _worker_decoder.decode(image)
+
+
+class ServiceBusy(Exception):
+    """Levée lorsque la file d'attente du service est pleine."""
+
+
+class DecodeService:
+    """Service de décodage avec file d'attente bornée et délai maximal par requête.
+
+    Args:
+        version: La version du protocole à décoder.
+        workers: Le nombre de processus de décodage (par défaut, le nombre de cœurs).
+        max_pending: Le nombre maximal de requêtes admises (en cours ou en attente).
+            Au-delà, les requêtes sont refusées immédiatement (HTTP 503).
+        timeout: Le délai maximal de décodage d'une requête, en secondes (HTTP 504).
+    """
+
+    def __init__(self, version: str = "1", workers: int | None = None, max_pending: int = 32, timeout: float = 5.0) -> None:
+        if max_pending < 1:
+            raise ValueError(f"max_pending doit être strictement positif : {max_pending}")
+        self.version = version
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.metrics = ServiceMetrics()
+        self._pending = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        """Démarre le pool de décodage et le serveur HTTP (port 0 : port libre choisi par l'OS)."""
+        global _worker_decoder
+        # Tables calculées une fois dans le parent, héritées par les workers
+        _worker_decoder = HexagonalDecoder(self.version)
+        self._start_pool()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    def _start_pool(self) -> None:
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=fork_context(),
+                                         initializer=_init_worker, initargs=(self.version,))
+
+    def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Remplace un pool dont un worker est mort (les requêtes suivantes sont de nouveau servies)."""
+        if self._pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._start_pool()
+
+    @property
+    def port(self) -> int:
+        """Le port effectif d'écoute du serveur."""
+        assert self._server is not None, "Service non démarré"
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Arrête le serveur HTTP puis le pool de décodage."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def decode(self, data: bytes) -> str:
+        """Décode une image dans le pool, en respectant la file bornée et le délai maximal.
+
+        Raises:
+            ServiceBusy: Si `max_pending` requêtes sont déjà admises.
+            asyncio.TimeoutError: Si le décodage dépasse `timeout` secondes.
+            DecodeError: Si l'image ne peut pas être décodée.
+            BrokenProcessPool: Si un worker est mort pendant le décodage (le pool est remplacé).
+        """
+        pool = self._pool
+        assert pool is not None, "Service non démarré"
+        if self._pending >= self.max_pending:
+            raise ServiceBusy()
+        self._pending += 1
+        self.metrics.in_flight.inc()
+        try:
+            future = pool.submit(_decode_image_bytes, data)
+        except BaseException as error:
+            self._release()
+            if isinstance(error, BrokenProcessPool):
+                self._restart_pool(pool)
+            raise
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except BrokenProcessPool:
+            self._restart_pool(pool)
+            raise
+        finally:
+            # Un décodage qui n'a pas encore démarré est retiré de la file. Un décodage déjà
+            # démarré ne peut pas être interrompu : il reste compté dans la file jusqu'à sa fin.
+            if future.cancel() or future.done():
+                self._release()
+            else:
+                loop = asyncio.get_running_loop()
+                future.add_done_callback(lambda _: _call_soon(loop, self._release))
+
+    def _release(self) -> None:
+        self._pending -= 1
+        self.metrics.in_flight.dec()
+
+    async def _handle_decode(self, body: bytes) -> tuple[int, dict[str, str]]:
+        started = time.perf_counter()
+        try:
+            text = await self.decode(body)
+        except ServiceBusy:
+            status, payload, outcome = 503, {"error": "File d'attente pleine"}, "rejected"
+        except asyncio.TimeoutError:
+            status, payload, outcome = 504, {"error": f"Décodage trop long (> {self.timeout:g} s)"}, "timeout"
+        except DecodeError as error:
+            status, payload, outcome = 422, {"error": str(error)}, "error"
+        except BrokenProcessPool:
+            status, payload, outcome = 503, {"error": "Processus de décodage interrompu"}, "failed"
+        except Exception as error:
+            status, payload, outcome = 500, {"error": f"Erreur de décodage : {type(error).__name__}"}, "failed"
+        else:
+            status, payload, outcome = 200, {"text": text}, "ok"
+            self.metrics.decoded_bytes.inc(amount=len(text.encode("utf-8")))
+        self.metrics.requests.inc(outcome)
+        self.metrics.latency.observe(time.perf_counter() - started)
+        return status, payload
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                status, content_type, body = await self._handle_request(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception:
+                status, content_type, body = _json_response(500, {"error": "Erreur interne"})
+            head = (f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    "Connection: close\r\n\r\n")
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader) -> tuple[int, str, bytes]:
+        """Lit une requête HTTP/1.1 et retourne (statut, type de contenu, corps)."""
+        request_line = (await reader.readline()).decode("latin-1").split()
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if len(request_line) != 3:
+            return _json_response(400, {"error": "Requête invalide"})
+        method, path = request_line[0], request_line[1]
+
+        if path == "/metrics" and method == "GET":
+            return 200, "text/plain; version=0.0.4", self.metrics.render().encode("utf-8")
+        if path == "/health" and method == "GET":
+            return _json_response(200, {"status": "ok"})
+        if path != "/decode":
+            return _json_response(404, {"error": f"Route inconnue : {path}"})
+        if method != "POST":
+            return _json_response(405, {"error": "Méthode non autorisée"})
+        try:
+            length = int(headers.get("content-length", ""))
+        except ValueError:
+            length = -1
+        if length < 0:
+            return _json_response(400, {"error": "En-tête Content-Length manquant ou invalide"})
+        if length > MAX_BODY_BYTES:
+            return _json_response(413, {"error": f"Image trop volumineuse ({length} octets)"})
+        body = await reader.readexactly(length)
+        return _json_response(*await self._handle_decode(body))
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], object]) -> None:
+    """Planifie `callback` dans la boucle depuis un autre thread (ignoré si la boucle est fermée)."""
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass
+
+
+def _json_response(status: int, payload: dict[str, str]) -> tuple[int, str, bytes]:
+    return status, "application/json; charset=utf-8", json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+async def serve(host: str, port: int, **options: object) -> None:
+    """Démarre le service et le fait tourner jusqu'à interruption."""
+    service = DecodeService(**options)  # type: ignore[arg-type]
+    server = await service.start(host, port)
+    print(f"Service de décodage à l'écoute sur http://{host}:{service.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Service local de décodage de grilles hexagonales.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--version", default="1", help="Version du protocole")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus de décodage")
+    parser.add_argument("--max-pending", type=int, default=32, help="Taille maximale de la file d'attente")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Délai maximal par requête (s)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, version=args.version, workers=args.workers,
+                          max_pending=args.max_pending, timeout=args.timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
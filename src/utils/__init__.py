@@ -1,3 +1,3 @@
-from .validators import Validator, OneOf
+from .validators import Validator, OneOf, trusted
 
-__all__ = ["Validator", "OneOf"]
+__all__ = ["Validator", "OneOf", "trusted"]
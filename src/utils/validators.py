@@ -1,9 +1,37 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Generic, TypeVar
 
+import numpy as np
+
 # T_Val représente le type de la valeur que le validateur va manipuler.
 T_Val = TypeVar('T_Val')
 
+# Vrai pendant une construction de confiance (voir `trusted`)
+_trusted: ContextVar[bool] = ContextVar("_trusted", default=False)
+
+
+@contextmanager
+def trusted() -> Iterator[None]:
+    """Contexte dans lequel les descripteurs assignent les valeurs sans les valider.
+
+    À réserver aux données déjà validées (ex: en bloc avec `validate_many`), pour
+    construire des milliers d'objets sans payer la validation de chaque attribut.
+
+    Usage :
+        OneOf.validate_many(...)  # Validation en bloc
+        with trusted():
+            objets = [MaClasse(...) for ...]
+    """
+    token = _trusted.set(True)
+    try:
+        yield
+    finally:
+        _trusted.reset(token)
+
+
 class Validator(Generic[T_Val], ABC):
     """Classe de base abstraite et générique pour les validateurs d'attributs."""
 
@@ -25,8 +53,12 @@ class Validator(Generic[T_Val], ABC):
         return getattr(obj, self.private_name)
 
     def __set__(self, obj: object, value: T_Val) -> None:
-        """Valide et assigne la nouvelle valeur (de type T_Val) à l'attribut privé managé."""
-        self.validate(value)
+        """Valide et assigne la nouvelle valeur (de type T_Val) à l'attribut privé managé.
+
+        La validation est omise dans un contexte `trusted()`.
+        """
+        if not _trusted.get():
+            self.validate(value)
         setattr(obj, self.private_name, value)
 
     @abstractmethod
@@ -36,6 +68,14 @@ class Validator(Generic[T_Val], ABC):
         """
         pass
 
+    def validate_many(self, values: Iterable[T_Val] | np.ndarray) -> None:
+        """Valide un ensemble de valeurs. Lève la même erreur que `validate` pour la première valeur invalide.
+
+        Les sous-classes peuvent la redéfinir avec une version vectorisée.
+        """
+        for value in values:
+            self.validate(value)
+
 
 class OneOf(Validator[T_Val]):
     """Validateur qui vérifie si une valeur fait partie d'un ensemble d'options prédéfinies."""
@@ -61,3 +101,27 @@ class OneOf(Validator[T_Val]):
             raise ValueError(
                 f"La valeur {value!r} n'est pas l'une des options valides : {self.options!r}"
             )
+
+    def validate_many(self, values: Iterable[T_Val] | np.ndarray) -> None:
+        """Valide en bloc un ensemble de valeurs.
+
+        Un tableau NumPy numérique est validé élément par élément avec `np.isin` lorsque
+        toutes les options sont des nombres. Dans les autres cas (options tuples ou
+        chaînes, itérables quelconques), chaque valeur passe par `validate` : une
+        conversion en tableau aplatirait les tuples ou convertirait les types.
+
+        Args:
+            values: Les valeurs à valider.
+
+        Raises:
+            ValueError: Pour la première valeur invalide, avec le même message que `validate`.
+        """
+        numeric_options = all(isinstance(option, (int, float, np.number)) for option in self.options)
+        if not (isinstance(values, np.ndarray) and values.dtype.kind in "biuf" and numeric_options):
+            # Un tableau est toujours validé élément par élément, comme dans la version vectorisée
+            super().validate_many(values.ravel().tolist() if isinstance(values, np.ndarray) else values)
+            return
+        valid = np.isin(values, list(self.options))
+        if not valid.all():
+            # .item() : message identique à `validate` (valeur Python et non scalaire NumPy)
+            self.validate(values[~valid].flat[0].item())
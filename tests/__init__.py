@@ -1 +1,12 @@
-# This file can be empty, but it makes Python treat the 'tests' directory as a package. 
\ No newline at end of file
+# This file can be empty, but it makes Python treat the 'tests' directory as a package. 
+import atexit
+import os
+import shutil
+import tempfile
+
+# Les tests n'écrivent pas dans le cache de l'utilisateur (~/.cache/weird-qr-code) :
+# le cache de la session est un répertoire temporaire, supprimé à la fin des tests.
+# Défini avant tout import de src, et hérité par les processus workers.
+_CACHE_DIR = tempfile.mkdtemp(prefix="hexqr-test-cache-")
+os.environ["HEXQR_CACHE_DIR"] = _CACHE_DIR
+atexit.register(shutil.rmtree, _CACHE_DIR, ignore_errors=True)
@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+from PIL import ImageDraw
+from src.core.hex_grid import AxialPos, HexgridLayout, Hexagon, PixelCoord
+from src.core.structure import grid_positions
+from src.core.encoder import HexagonalEncoder
+from src.core.decoder import HexagonalDecoder
+from src.core.consensus import build_neighbor_table, neighbor_consensus
+from src.core.tracking import SequenceDecoder
+
+
+def streaks(image, box, offset=0, pitch=6, width=3):
+    """Ajoute des reflets en stries blanches obliques, plus fines qu'une cellule, dans une boîte."""
+    image = image.copy()
+    draw = ImageDraw.Draw(image)
+    x0, y0, x1, y1 = box
+    for x in range(x0 - (y1 - y0) + offset, x1, pitch):
+        draw.line((x, y1, x + (y1 - y0), y0), fill=(250, 250, 250), width=width)
+    return image
+
+
+class TestNeighborTable(unittest.TestCase):
+
+    def test_matches_get_neighbors(self):
+        """La table reprend les voisins de `Hexagon.get_neighbors`, -1 hors de la grille."""
+        positions = grid_positions("1")
+        table = build_neighbor_table(positions)
+        layout = HexgridLayout(size=1.0, origin=PixelCoord(0, 0))
+        for i in (0, 220, len(positions) - 1):
+            expected = [n.pos for n in Hexagon(pos=positions[i], layout=layout).get_neighbors()]
+            got = [positions[j] if j >= 0 else None for j in table[i]]
+            self.assertEqual(got, [pos if pos in positions else None for pos in expected])
+        self.assertIn(-1, table[0])
+        self.assertNotIn(-1, table[positions.index(AxialPos(0, 0))])
+
+
+class TestNeighborConsensus(unittest.TestCase):
+
+    def setUp(self):
+        self.message = "Consensus des voisins " * 4
+        self.image = HexagonalEncoder().encode(self.message)
+        self.decoder = HexagonalDecoder()
+        self.reading = self.decoder.decode_cells(self.image)
+
+    def test_unexplained_color_is_disagreement(self):
+        """Des votes pour une couleur absente du voisinage comptent comme désaccord, pas ceux d'une voisine."""
+        neighbors = np.array([[1, 2, -1, -1, -1, -1], [0, -1, -1, -1, -1, -1], [0, -1, -1, -1, -1, -1]])
+        probabilities = np.array([[0.6, 0.4, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0]])
+        self.assertEqual(neighbor_consensus(probabilities, neighbors).disagreement[0], 0.0)
+        probabilities[0] = [0.6, 0.0, 0.0, 0.4]
+        scores = neighbor_consensus(probabilities, neighbors)
+        self.assertAlmostEqual(scores.disagreement[0], 0.4)
+        self.assertTrue(scores.erasures[0])
+
+    def test_clean_images_have_no_erasures(self):
+        """Sur une image nette, aucune cellule n'est effacée, même pour un message court ou répétitif."""
+        for message in (self.message, "Hi", "U" * 40):
+            with self.subTest(message=message):
+                reading = self.decoder.decode_cells(HexagonalEncoder().encode(message))
+                self.assertEqual(len(self.decoder.data_erasures(self.decoder.consensus(reading))), 0)
+
+    def streaked_frames(self):
+        width, height = self.image.size
+        box = (int(0.3 * width), int(0.35 * height), int(0.7 * width), int(0.65 * height))
+        return [streaks(self.image, box, offset=0), streaks(self.image, box, offset=3)]
+
+    def test_glare_erasures_are_misreads(self):
+        """Sous des reflets, la plupart des cellules mal lues sont effacées, et presque seulement elles."""
+        reading = self.decoder.read_cells(np.asarray(self.streaked_frames()[0]), self.reading.transform)
+        erasures = self.decoder.consensus(reading).erasures
+        wrong = reading.symbols != self.reading.symbols
+        self.assertGreater((erasures & wrong).sum(), 0.5 * wrong.sum())
+        self.assertLessEqual((erasures & ~wrong).sum(), 0.05 * erasures.sum())
+
+    def test_sequence_recovers_from_glare(self):
+        """Les lectures effacées pèsent peu : une seule image nette suffit après deux images avec reflets."""
+        sequence = SequenceDecoder()
+        for frame in self.streaked_frames() + [self.image]:
+            result = sequence.process(frame)
+        self.assertEqual(result.message, self.message)
+
+
+if __name__ == '__main__':
+    unittest.main()
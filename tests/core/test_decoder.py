@@ -0,0 +1,103 @@
+import time
+import unittest
+import numpy as np
+from PIL import Image, ImageDraw
+from src.core.constants import ProtocolColor, SYMBOL_COLORS
+from src.core.encoder import HexagonalEncoder
+from src.core.decoder import HexagonalDecoder, DecodeError, build_classifier_lut, build_decoder_tables, find_finder_candidates
+
+
+class TestDecoderTables(unittest.TestCase):
+
+    def test_tables_are_cached_and_read_only(self):
+        """Les tables sont calculées une seule fois par version et non modifiables."""
+        self.assertIs(build_decoder_tables("1"), build_decoder_tables("1"))
+        with self.assertRaises(ValueError):
+            build_decoder_tables("1").centers[0, 0] = 1.0
+
+    def test_classifier_lut(self):
+        """La table associe chaque couleur du protocole à son symbole."""
+        lut = build_classifier_lut()
+        for symbol, color in enumerate(SYMBOL_COLORS):
+            with self.subTest(color=color):
+                r, g, b = (channel >> 3 for channel in color.rgb)
+                self.assertEqual(lut[r, g, b], symbol)
+        self.assertEqual(lut[200 >> 3, 30 >> 3, 40 >> 3], SYMBOL_COLORS.index(ProtocolColor.RED))
+
+
+class TestHexagonalDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = HexagonalEncoder(hex_size=6.0)
+        self.decoder = HexagonalDecoder()
+
+    def test_round_trip(self):
+        """Un message encodé est décodé à l'identique."""
+        for message in ["", "Bonjour", "Hexagones é ✓", "x" * self.encoder.capacity]:
+            with self.subTest(message=message):
+                self.assertEqual(self.decoder.decode(self.encoder.encode(message)), message)
+
+    def test_rotation_and_scaling(self):
+        """Les repères permettent de retrouver la grille tournée et agrandie."""
+        image = self.encoder.encode("Rotation")
+        for angle in (0, 17, 90, 200):
+            with self.subTest(angle=angle):
+                rotated = image.rotate(angle, expand=True, fillcolor=(255, 255, 255))
+                scaled = rotated.resize((rotated.width * 3 // 2, rotated.height * 3 // 2))
+                self.assertEqual(self.decoder.decode(scaled), "Rotation")
+
+    def test_confidences(self):
+        """Sur une image propre, toutes les cellules sont lues avec certitude."""
+        reading = self.decoder.decode_cells(self.encoder.encode("abc"))
+        self.assertTrue(np.all(reading.confidences == 1.0))
+
+    def test_missing_finders(self):
+        """Une image sans grille lève une DecodeError."""
+        with self.assertRaisesRegex(DecodeError, "Repères d'alignement introuvables"):
+            self.decoder.decode(Image.new("RGB", (100, 100), (255, 255, 255)))
+
+    def test_cluttered_frame(self):
+        """Avec des centaines de repères candidats (autres grilles plus petites), le décodage reste rapide."""
+        target = HexagonalEncoder(hex_size=8.0).encode("Cible")
+        small = HexagonalEncoder(hex_size=3.0).encode("x")
+        canvas = Image.new("RGB", (target.width + 16 * small.width, max(target.height, 4 * small.height)), (128, 128, 128))
+        canvas.paste(target, (0, 0))
+        for i in range(16):
+            for j in range(4):
+                canvas.paste(small, (target.width + i * small.width, j * small.height))
+        candidates = find_finder_candidates(self.decoder.classify(np.asarray(canvas)))
+        self.assertGreater(len(candidates), 150)
+        started = time.perf_counter()
+        self.assertEqual(self.decoder.decode(canvas), "Cible")
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_decoys_before_target(self):
+        """Des leurres placés avant la grille dans l'ordre de balayage (au-dessus, à gauche) ne l'écartent pas."""
+        target = HexagonalEncoder(hex_size=8.0).encode("Cible")
+        small = HexagonalEncoder(hex_size=3.0).encode("x")
+        rows = 3
+        canvas = Image.new("RGB", (8 * small.width + target.width, rows * small.height + target.height), (128, 128, 128))
+        for i in range(8 + target.width // small.width):
+            for j in range(rows):
+                canvas.paste(small, (i * small.width, j * small.height))
+        for i in range(8):
+            canvas.paste(small, (i * small.width, rows * small.height))
+        canvas.paste(target, (8 * small.width, rows * small.height))
+        with self.subTest(decoys="grilles"):
+            self.assertEqual(self.decoder.decode(canvas), "Cible")
+
+        # Disques rouges à centre blanc, de la taille des repères, à gauche de la grille
+        size = 8.0
+        canvas = Image.new("RGB", (target.width + 10 * int(6 * size), target.height), ProtocolColor.WHITE.rgb)
+        draw = ImageDraw.Draw(canvas)
+        for k in range(40):
+            x, y = (k % 10 + 0.5) * 6 * size, (k // 10 + 0.5) * 6 * size
+            draw.ellipse((x - 2 * size, y - 2 * size, x + 2 * size, y + 2 * size), fill=ProtocolColor.RED.rgb)
+            draw.ellipse((x - size, y - size, x + size, y + size), fill=ProtocolColor.WHITE.rgb)
+        canvas.paste(target, (10 * int(6 * size), 0))
+        with self.subTest(decoys="disques"):
+            self.assertEqual(self.decoder.decode(canvas), "Cible")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from src.core.constants import SYMBOL_COLORS
+from src.core.encoder import HexagonalEncoder
+from src.core.decoder import HexagonalDecoder, build_decoder_tables
+from src.core.drawing import render_cells, render_cells_antialiased
+
+
+class TestRenderAntialiased(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = HexagonalEncoder(hex_size=8.0)
+        self.cells = self.encoder.encode_cells("Anticrénelage")
+
+    def test_cell_centers_keep_their_color(self):
+        """Le centre de chaque cellule a exactement la couleur du protocole."""
+        image = np.asarray(render_cells_antialiased(self.encoder.layout, self.cells, self.encoder.image_size))
+        origin = self.encoder.layout.origin
+        centers = build_decoder_tables("1").centers * self.encoder.layout.size + (origin.x, origin.y)
+        for pos, (x, y) in zip(build_decoder_tables("1").positions, np.rint(centers).astype(int)):
+            self.assertEqual(tuple(image[y, x]), self.cells[pos].rgb)
+
+    def test_edges_are_blended(self):
+        """Les bords contiennent des couleurs intermédiaires, absentes du rendu crénelé."""
+        aliased = render_cells(self.encoder.layout, self.cells, self.encoder.image_size)
+        smooth = render_cells_antialiased(self.encoder.layout, self.cells, self.encoder.image_size)
+        protocol_colors = {color.rgb for color in SYMBOL_COLORS}
+        self.assertTrue({color for _, color in aliased.getcolors(1 << 16)} <= protocol_colors)
+        self.assertGreater(len(smooth.getcolors(1 << 16)), len(protocol_colors))
+
+    def test_band_height_does_not_change_result(self):
+        """Le découpage en bandes ne change pas l'image, pixel à pixel."""
+        images = [render_cells_antialiased(self.encoder.layout, self.cells, self.encoder.image_size,
+                                           supersample=4, band_height=h).tobytes()
+                  for h in (1, 7, 10_000)]
+        self.assertEqual(images[0], images[1])
+        self.assertEqual(images[0], images[2])
+
+    def test_decodable(self):
+        """Le rendu anticrénelé reste décodable."""
+        image = render_cells_antialiased(self.encoder.layout, self.cells, self.encoder.image_size)
+        self.assertEqual(HexagonalDecoder().decode(image), "Anticrénelage")
+
+
+if __name__ == '__main__':
+    unittest.main()
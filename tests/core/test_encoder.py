@@ -0,0 +1,91 @@
+import unittest
+from src.core.hex_grid import AxialPos, HEX_DIRECTIONS_FLAT_TOP
+from src.core.constants import ProtocolColor, FINDER_POS_TL, FINDER_POS_BL, SYMBOL_COLORS
+from src.core.structure import CellRole, build_role_map, build_data_path, grid_positions
+from src.core.encoder import HexagonalEncoder, bytes_to_symbols, symbols_to_bytes
+from src.core.batch import encode_many
+
+
+class TestStructure(unittest.TestCase):
+
+    def test_role_map_covers_grid(self):
+        """Chaque position de la grille a un rôle, 21 cellules pour les 3 repères."""
+        role_map = build_role_map("1")
+        self.assertEqual(len(role_map), len(grid_positions("1")))
+        finder_cells = [pos for pos, role in role_map.items() if role is CellRole.FINDER]
+        self.assertEqual(len(finder_cells), 21)
+        self.assertIs(role_map[FINDER_POS_TL], CellRole.FINDER)
+
+    def test_data_path_is_serpentine(self):
+        """Le chemin couvre toutes les cellules de données, une seule fois."""
+        path = build_data_path("1")
+        self.assertEqual(len(path), len(set(path)))
+        self.assertEqual(path[0], AxialPos(-10, -10))
+        self.assertNotIn(FINDER_POS_BL, path)
+        # Deuxième colonne parcourue dans le sens inverse
+        self.assertEqual(path[21], AxialPos(-9, 10))
+
+    def test_unknown_version(self):
+        """Une version inconnue lève une ValueError."""
+        with self.assertRaisesRegex(ValueError, "Version de protocole inconnue"):
+            build_role_map("99")
+
+
+class TestHexagonalEncoder(unittest.TestCase):
+
+    def test_symbol_round_trip(self):
+        """Conversion octets -> symboles -> octets, bits de poids fort en premier."""
+        self.assertEqual(bytes_to_symbols(b"\x1b"), [0, 1, 2, 3])
+        data = "Hexagone é".encode("utf-8")
+        self.assertEqual(symbols_to_bytes(bytes_to_symbols(data)), data)
+
+    def test_encode_cells(self):
+        """Les repères gardent leurs couleurs et l'en-tête contient la longueur."""
+        encoder = HexagonalEncoder()
+        cells = encoder.encode_cells("Hi")
+        self.assertEqual(cells[FINDER_POS_TL], ProtocolColor.WHITE)
+        self.assertEqual(cells[FINDER_POS_BL + HEX_DIRECTIONS_FLAT_TOP["east"]], ProtocolColor.BLUE)
+        header = [SYMBOL_COLORS.index(cells[pos]) for pos in encoder.data_path[:8]]
+        self.assertEqual(symbols_to_bytes(header), (2).to_bytes(2, "big"))
+
+    def test_invalid_parameters(self):
+        """Les paramètres sont validés par les descripteurs OneOf."""
+        with self.assertRaisesRegex(ValueError, "La valeur '7' n'est pas l'une des options valides"):
+            HexagonalEncoder(version="7")
+        with self.assertRaisesRegex(ValueError, "La valeur 'H' n'est pas l'une des options valides"):
+            HexagonalEncoder(ecc_level="H")
+
+    def test_message_too_long(self):
+        """Un message dépassant la capacité lève une ValueError."""
+        encoder = HexagonalEncoder()
+        with self.assertRaisesRegex(ValueError, "Message trop long"):
+            encoder.encode("x" * (encoder.capacity + 1))
+
+    def test_encode_image(self):
+        """L'image a la taille calculée par le layout."""
+        encoder = HexagonalEncoder(hex_size=6.0)
+        image = encoder.encode("Bonjour")
+        self.assertEqual(image.size, encoder.image_size)
+        self.assertEqual(image.mode, "RGB")
+
+
+class TestEncodeMany(unittest.TestCase):
+
+    def test_results_in_order(self):
+        """Les images parallèles sont identiques à l'encodage séquentiel, dans l'ordre."""
+        messages = [f"message {i}" for i in range(7)]
+        encoder = HexagonalEncoder(hex_size=4.0)
+        results = list(encode_many(iter(messages), workers=2, chunksize=2, hex_size=4.0))
+        self.assertEqual(len(results), len(messages))
+        for message, image in zip(messages, results):
+            with self.subTest(message=message):
+                self.assertEqual(image.tobytes(), encoder.encode(message).tobytes())
+
+    def test_single_worker_inline(self):
+        """Avec un seul worker, l'encodage se fait sans pool."""
+        results = list(encode_many(["a", "b"], workers=1, hex_size=4.0))
+        self.assertEqual(len(results), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
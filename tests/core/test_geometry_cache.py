@@ -0,0 +1,103 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+import numpy as np
+from src.core.geometry_cache import GeometryCache, code_version, default_cache, set_default_cache
+from src.core.decoder import build_decoder_tables
+
+
+class TestGeometryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = GeometryCache(self.directory.name)
+        self.builds = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build(self):
+        self.builds += 1
+        return np.arange(1000, dtype=np.int64)
+
+    def test_build_once_then_memory_map(self):
+        """La table est calculée une fois, puis projetée en mémoire en lecture seule."""
+        first = self.cache.load_or_build("table", ("1",), self.build)
+        second = GeometryCache(self.directory.name).load_or_build("table", ("1",), self.build)
+        self.assertEqual(self.builds, 1)
+        self.assertIsInstance(second, np.memmap)
+        self.assertFalse(second.flags.writeable)
+        np.testing.assert_array_equal(first, second)
+
+    def test_key_depends_on_name_and_parameters(self):
+        """Le fichier d'une table dépend de son nom et de ses paramètres."""
+        self.assertNotEqual(self.cache.path("table", ("1",)), self.cache.path("table", ("2",)))
+        self.assertNotEqual(self.cache.path("table", ("1",)), self.cache.path("autre", ("1",)))
+
+    def test_key_depends_on_library_versions(self):
+        """Une autre version de numpy ou de Pillow invalide les tables (rastérisations comprises)."""
+        path = self.cache.path("table", ("1",))
+        numpy_version = np.__version__
+        try:
+            np.__version__ = numpy_version + "+autre"
+            code_version.cache_clear()
+            self.assertNotEqual(self.cache.path("table", ("1",)), path)
+        finally:
+            np.__version__ = numpy_version
+            code_version.cache_clear()
+        self.assertEqual(self.cache.path("table", ("1",)), path)
+
+    def test_no_temporary_files_left(self):
+        """L'écriture passe par un fichier temporaire renommé : il n'en reste aucun."""
+        self.cache.load_or_build("table", ("1",), self.build)
+        self.assertEqual([path.suffix for path in Path(self.directory.name).iterdir()], [".npy"])
+
+    def test_corrupted_file_is_rebuilt(self):
+        """Un fichier illisible est recalculé et remplacé."""
+        path = self.cache.path("table", ("1",))
+        path.write_bytes(b"pas un fichier npy")
+        array = self.cache.load_or_build("table", ("1",), self.build)
+        self.assertEqual(self.builds, 1)
+        np.testing.assert_array_equal(array, np.arange(1000))
+
+    def test_eviction_removes_least_recently_used(self):
+        """Au-delà de la taille maximale, les tables les moins récemment utilisées sont supprimées."""
+        cache = GeometryCache(self.directory.name, max_bytes=20_000)
+        for i in range(2):
+            cache.load_or_build("table", (i,), self.build)
+        old = time.time() - 60
+        os.utime(cache.path("table", (0,)), (old, old))
+        os.utime(cache.path("table", (1,)), (old - 60, old - 60))
+        cache.load_or_build("table", (0,), self.build)  # Utilisation récente
+        cache.load_or_build("table", (2,), self.build)
+        self.assertLessEqual(cache.size(), 20_000)
+        self.assertFalse(cache.path("table", (1,)).exists())
+        self.assertTrue(cache.path("table", (0,)).exists())
+        self.assertTrue(cache.path("table", (2,)).exists())
+
+    def test_disabled_cache(self):
+        """Sans répertoire, la table est calculée en mémoire à chaque appel."""
+        cache = GeometryCache(None)
+        array = cache.load_or_build("table", ("1",), self.build)
+        cache.load_or_build("table", ("1",), self.build)
+        self.assertEqual(self.builds, 2)
+        self.assertFalse(array.flags.writeable)
+
+    def test_decoder_tables_use_default_cache(self):
+        """Les tables du décodeur passent par le cache du processus."""
+        set_default_cache(self.cache)
+        try:
+            build_decoder_tables.cache_clear()
+            tables = build_decoder_tables("1")
+            self.assertIsInstance(tables.neighbors, np.memmap)
+            self.assertTrue(self.cache.path("neighbors", ("1",)).exists())
+        finally:
+            set_default_cache(None)
+            build_decoder_tables.cache_clear()
+        self.assertIsNot(default_cache(), self.cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
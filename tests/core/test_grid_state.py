@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.hex_grid import AxialPos
+from src.core.constants import ProtocolColor
+from src.core.structure import grid_positions
+from src.core.encoder import HexagonalEncoder
+from src.core.grid_state import (
+    GridState, GridCorpus, GridCorpusWriter, pack_symbols, unpack_symbols, STATE_HEADER,
+)
+
+
+class TestPacking(unittest.TestCase):
+
+    def test_pack_unpack(self):
+        """4 symboles par octet, premier symbole dans les bits de poids fort."""
+        self.assertEqual(bytes(pack_symbols([0, 1, 2, 3, 3])), b"\x1b\xc0")
+        np.testing.assert_array_equal(unpack_symbols(b"\x1b\xc0", 5), [0, 1, 2, 3, 3])
+
+    def test_invalid_symbol(self):
+        """Un symbole hors de 0..3 lève une ValueError."""
+        with self.assertRaisesRegex(ValueError, "Symbole invalide"):
+            pack_symbols([0, 4])
+
+
+class TestGridState(unittest.TestCase):
+
+    def setUp(self):
+        self.cells = HexagonalEncoder().encode_cells("état")
+        self.state = GridState.from_cells("1", self.cells)
+
+    def test_round_trip(self):
+        """Sérialisation puis lecture sans perte, 2 bits par cellule."""
+        data = self.state.to_bytes()
+        self.assertEqual(len(data), STATE_HEADER.size + -(-len(grid_positions("1")) // 4))
+        restored = GridState.from_buffer(data)
+        self.assertEqual(restored, self.state)
+        self.assertEqual(restored.cells(), self.cells)
+
+    def test_zero_copy(self):
+        """La charge utile lue est une vue sur le tampon d'origine."""
+        buffer = bytearray(self.state.to_bytes())
+        restored = GridState.from_buffer(buffer)
+        buffer[STATE_HEADER.size] ^= 0xFF
+        self.assertNotEqual(restored, self.state)
+
+    def test_corrupted_checksum(self):
+        """Une charge utile modifiée est détectée par la somme de contrôle."""
+        buffer = bytearray(self.state.to_bytes())
+        buffer[-1] ^= 0x01
+        with self.assertRaisesRegex(ValueError, "Somme de contrôle"):
+            GridState.from_buffer(buffer)
+
+    def test_diff(self):
+        """diff retourne les positions des cellules modifiées."""
+        changed = dict(self.cells)
+        pos = AxialPos(3, -2)
+        changed[pos] = ProtocolColor.RED if self.cells[pos] is not ProtocolColor.RED else ProtocolColor.BLUE
+        self.assertEqual(self.state.diff(GridState.from_cells("1", changed)), [pos])
+        self.assertEqual(self.state.diff(self.state), [])
+
+
+class TestGridCorpus(unittest.TestCase):
+
+    def test_write_and_mmap(self):
+        """Un corpus écrit en flux est relu par projection en mémoire."""
+        encoder = HexagonalEncoder()
+        states = [GridState.from_cells("1", encoder.encode_cells(f"grille {i}")) for i in range(5)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.hxgc")
+            with GridCorpusWriter(path) as writer:
+                for state in states:
+                    writer.write(state)
+            with GridCorpus(path) as corpus:
+                self.assertEqual(len(corpus), 5)
+                self.assertEqual(corpus[2], states[2])
+                self.assertEqual(corpus[-1], states[-1])
+                self.assertEqual(list(corpus), states)
+                payloads = corpus.payloads()
+                self.assertEqual(payloads.shape, (5, GridState.payload_size("1")))
+                np.testing.assert_array_equal(unpack_symbols(payloads, len(grid_positions("1")))[3], states[3].symbols())
+
+    def test_close_with_live_states(self):
+        """Fermer le corpus pendant que des états sont référencés ne lève pas d'erreur ; ils restent lisibles."""
+        encoder = HexagonalEncoder()
+        states = [GridState.from_cells("1", encoder.encode_cells(f"grille {i}")) for i in range(3)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.hxgc")
+            with GridCorpusWriter(path) as writer:
+                for state in states:
+                    writer.write(state)
+            with GridCorpus(path) as corpus:
+                for state in corpus:
+                    pass
+                payloads = corpus.payloads()
+            self.assertEqual(state, states[-1])
+            self.assertEqual(payloads.shape[0], 3)
+            with self.assertRaises(ValueError):
+                corpus[0]
+            del state, payloads
+
+    def test_invalid_files(self):
+        """Un fichier trop court, d'un autre format ou tronqué est refusé par une ValueError."""
+        state = GridState.from_cells("1", HexagonalEncoder().encode_cells("grille"))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.hxgc")
+            with GridCorpusWriter(path) as writer:
+                writer.write(state)
+                writer.write(state)
+            with open(path, "rb") as file:
+                complete = file.read()
+            contents = {"vide": b"", "court": b"HXGC", "format": b"XXXX" + complete[4:], "tronqué": complete[:-1]}
+            for name, data in contents.items():
+                with self.subTest(file=name):
+                    with open(path, "wb") as file:
+                        file.write(data)
+                    with self.assertRaisesRegex(ValueError, "Fichier de corpus"):
+                        GridCorpus(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
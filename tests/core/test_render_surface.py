@@ -0,0 +1,55 @@
+import random
+import unittest
+from src.core.hex_grid import AxialPos
+from src.core.constants import ProtocolColor, SYMBOL_COLORS
+from src.core.encoder import HexagonalEncoder
+from src.core.drawing import render_cells
+from src.core.render_surface import RenderSurface
+
+
+class TestRenderSurface(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = HexagonalEncoder(hex_size=5.0)
+        self.surface = RenderSurface(self.encoder.layout, self.encoder.image_size, self.encoder.encode_cells("abc"))
+
+    def test_matches_full_render(self):
+        """Après des modifications incrémentales, l'image est identique à un rendu complet."""
+        rng = random.Random(7)
+        positions = list(self.surface.cells)
+        for size in (1.0, 1.5, 2.0, 2.5, 3.0, 5.0, 7.3, 12.0):
+            encoder = HexagonalEncoder(hex_size=size)
+            surface = RenderSurface(encoder.layout, encoder.image_size, encoder.encode_cells("abc"))
+            for _ in range(20):
+                for _ in range(rng.randint(1, 4)):
+                    surface.set_cell(rng.choice(positions), rng.choice(SYMBOL_COLORS))
+                surface.flush()
+                with self.subTest(size=size):
+                    expected = render_cells(encoder.layout, surface.cells, encoder.image_size)
+                    self.assertEqual(surface.image.tobytes(), expected.tobytes())
+
+    def test_changed_regions(self):
+        """flush retourne la boîte de chaque cellule modifiée, et seulement celle-là."""
+        pos = AxialPos(2, 3)
+        before = self.surface.image.copy()
+        new_color = ProtocolColor.RED if self.surface.cells[pos] is not ProtocolColor.RED else ProtocolColor.BLUE
+        self.surface.set_cell(pos, new_color)
+        self.assertEqual(self.surface.dirty, {pos})
+        regions = self.surface.flush()
+        self.assertEqual(regions, [self.surface.cell_box(pos)])
+        self.assertEqual(self.surface.dirty, frozenset())
+        # Les pixels hors de la zone retournée sont inchangés
+        x0, y0, x1, y1 = regions[0]
+        outside = before.copy()
+        outside.paste(self.surface.image.crop(regions[0]), (x0, y0))
+        self.assertEqual(outside.tobytes(), self.surface.image.tobytes())
+
+    def test_unchanged_color_is_not_dirty(self):
+        """Réassigner la même couleur ne provoque aucun redessin."""
+        pos = AxialPos(0, 0)
+        self.surface.set_cell(pos, self.surface.cells[pos])
+        self.assertEqual(self.surface.flush(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from src.core.encoder import HexagonalEncoder
+from src.core.decoder import HexagonalDecoder
+from src.core.scaled_render import ScaledRenderer, build_label_image, OUTLINE_LABEL
+
+
+class TestScaledRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = HexagonalEncoder(hex_size=6.0)
+        self.cells = self.encoder.encode_cells("Plusieurs tailles")
+        self.renderer = ScaledRenderer(hex_size=6.0)
+
+    def test_scale_one_matches_encoder(self):
+        """À l'échelle 1, l'image est celle de l'encodeur (hors contours des cellules noires)."""
+        scaled = np.asarray(self.renderer.render(self.cells))
+        reference = np.asarray(self.encoder.encode("Plusieurs tailles"))
+        inside = self.renderer.labels != OUTLINE_LABEL
+        np.testing.assert_array_equal(scaled[inside], reference[inside])
+
+    def test_integer_replication(self):
+        """Chaque pixel canonique devient un bloc k x k identique."""
+        base = np.asarray(self.renderer.render(self.cells))
+        for scale in (2, 3, 5):
+            image = np.asarray(self.renderer.render(self.cells, scale))
+            np.testing.assert_array_equal(image, base.repeat(scale, axis=0).repeat(scale, axis=1))
+
+    def test_check_cell_colors(self):
+        """La vérification sans perte accepte les rendus répliqués et refuse une image altérée."""
+        images = self.renderer.render_many(self.cells, (1, 2, 4))
+        for scale, image in zip((1, 2, 4), images):
+            self.assertTrue(self.renderer.check(image, self.cells, scale))
+        altered = images[1].copy()
+        x, y = self.renderer.centers[-1] * 2 + 1
+        altered.putpixel((int(x), int(y)), (12, 34, 56))
+        self.assertFalse(self.renderer.check(altered, self.cells, 2))
+        self.assertFalse(self.renderer.check(images[0], self.cells, 2))
+
+    def test_labels_are_cached(self):
+        """L'image d'étiquettes est calculée une fois par géométrie et n'est pas modifiable."""
+        self.assertIs(ScaledRenderer(hex_size=6.0).labels, self.renderer.labels)
+        self.assertFalse(self.renderer.labels.flags.writeable)
+
+    def test_invalid_parameters(self):
+        """Une échelle non entière positive ou un hex_size trop petit lèvent une ValueError."""
+        with self.assertRaises(ValueError):
+            self.renderer.render(self.cells, 0)
+        with self.assertRaises(ValueError):
+            build_label_image("1", 0.5, 2.0)
+
+    def test_encode_scaled_is_decodable(self):
+        """Les images produites par `encode_scaled` se décodent à toutes les échelles."""
+        decoder = HexagonalDecoder()
+        for image in self.encoder.encode_scaled("Plusieurs tailles", (1, 3)):
+            self.assertEqual(decoder.decode(image), "Plusieurs tailles")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from PIL import Image, ImageDraw
+from src.core.encoder import HexagonalEncoder
+from src.core.tracking import SequenceDecoder
+
+
+class TestSequenceDecoder(unittest.TestCase):
+
+    def setUp(self):
+        # Message long : les données couvrent presque toute la grille
+        self.message = "Suivi vidéo " * 7
+        self.code = HexagonalEncoder(hex_size=6.0).encode(self.message)
+        self.sequence = SequenceDecoder()
+
+    def frame(self, x, y, occlusion=None):
+        background = Image.new("RGB", (640, 480), (180, 180, 180))
+        background.paste(self.code, (x, y))
+        if occlusion is not None:
+            ImageDraw.Draw(background).rectangle(occlusion, fill=(0, 0, 0))
+        return background
+
+    def test_tracking_after_first_frame(self):
+        """Après la première détection complète, les repères sont suivis localement."""
+        results = [self.sequence.process(self.frame(20 + 4 * i, 10 + 2 * i)) for i in range(5)]
+        self.assertEqual([r.tracked for r in results], [False, True, True, True, True])
+        self.assertEqual(results[-1].message, self.message)
+
+    def test_fallback_when_tracking_is_lost(self):
+        """Un saut trop grand provoque une nouvelle détection complète."""
+        self.sequence.process(self.frame(20, 10))
+        result = self.sequence.process(self.frame(400, 100))
+        self.assertFalse(result.tracked)
+        self.assertIsNotNone(result.reading)
+
+    def test_switching_codes(self):
+        """Un nouveau code, retrouvé après une perte ou ailleurs dans l'image, remplace l'ancien message."""
+        other = HexagonalEncoder(hex_size=6.0).encode("Autre code")
+        blank = Image.new("RGB", (640, 480), (180, 180, 180))
+        for separator in ([blank], []):
+            with self.subTest(blank_frame=bool(separator)):
+                sequence = SequenceDecoder()
+                for i in range(5):
+                    sequence.process(self.frame(20 + 2 * i, 10))
+                for frame in separator:
+                    sequence.process(frame)
+                for i in range(3):
+                    frame = blank.copy()
+                    frame.paste(other, (400 - 2 * i, 100))
+                    result = sequence.process(frame)
+                    self.assertEqual(result.message, "Autre code")
+
+    def test_switching_codes_in_place(self):
+        """Un autre code présenté au même endroit remplace l'ancien message dès sa première lecture complète."""
+        sequence = SequenceDecoder()
+        first = HexagonalEncoder(hex_size=6.0).encode("Premier code")
+        second = HexagonalEncoder(hex_size=6.0).encode("Second code")
+        for i, code in enumerate([first] * 10 + [second] * 3):
+            frame = Image.new("RGB", (640, 480), (180, 180, 180))
+            frame.paste(code, (20 + i % 2, 10))
+            result = sequence.process(frame)
+        self.assertTrue(result.tracked)
+        self.assertEqual(result.message, "Second code")
+
+    def test_evidence_kept_across_short_loss(self):
+        """Une perte brève (repère masqué) n'efface pas les lectures accumulées."""
+        x, y = 20, 10
+        width = self.code.width
+        bands = [(x + 75, y + 120 + 50 * i, x + width - 10, y + 150 + 50 * i) for i in range(3)]
+        for band in bands[1:]:
+            self.sequence.process(self.frame(x, y, band))
+        # Un repère masqué : la grille est perdue le temps d'une image
+        lost = self.sequence.process(self.frame(x, y, (x + 88, y + 70, x + 128, y + 110)))
+        self.assertIsNone(lost.reading)
+        result = self.sequence.process(self.frame(x, y, bands[0]))
+        self.assertFalse(result.tracked)
+        self.assertEqual(result.message, self.message)
+
+    def test_lost_grid(self):
+        """Sans grille visible, le suivi est abandonné sans erreur."""
+        self.sequence.process(self.frame(20, 10))
+        result = self.sequence.process(Image.new("RGB", (640, 480), (180, 180, 180)))
+        self.assertIsNone(result.reading)
+        self.assertIsNone(self.sequence.transform)
+
+    def test_message_from_partial_reads(self):
+        """Des lectures occultées à des endroits différents se complètent."""
+        x, y = 20, 10
+        width = self.code.width
+        # Bandes horizontales occultant les données, sous le repère TR et à droite des repères TL/BL
+        bands = [(x + 75, y + 120 + 50 * i, x + width - 10, y + 150 + 50 * i) for i in range(3)]
+        first = SequenceDecoder().process(self.frame(x, y, bands[0]))
+        self.assertNotEqual(first.message, self.message)
+        for band in bands:
+            result = self.sequence.process(self.frame(x, y, band))
+            self.assertIsNotNone(result.reading)
+        self.assertEqual(result.message, self.message)
+
+    def test_reset(self):
+        """reset oublie la grille et les lectures."""
+        self.sequence.process(self.frame(20, 10))
+        self.sequence.reset()
+        self.assertIsNone(self.sequence.transform)
+        self.assertIsNone(self.sequence.message())
+
+
+if __name__ == '__main__':
+    unittest.main()
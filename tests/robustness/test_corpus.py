@@ -0,0 +1,75 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from PIL import Image
+from src.core.encoder import HexagonalEncoder
+from src.core.decoder import HexagonalDecoder
+from src.core.grid_state import GridCorpus, GridState
+from src.robustness.degradations import DegradationSpec, degrade
+from src.robustness.corpus import generate_corpus, item_rng
+
+SMALL_SPEC = DegradationSpec(canvas_size=(240, 240), scale=(0.8, 1.2))
+
+
+class TestDegrade(unittest.TestCase):
+
+    def test_deterministic(self):
+        """Même graine, même image dégradée."""
+        image = HexagonalEncoder(hex_size=3.0).encode("abc")
+        first, params = degrade(image, item_rng(1, 0), SMALL_SPEC)
+        second, _ = degrade(image, item_rng(1, 0), SMALL_SPEC)
+        self.assertEqual(first.shape, (240, 240, 3))
+        np.testing.assert_array_equal(first, second)
+        self.assertTrue(SMALL_SPEC.rotation[0] <= params["rotation"] <= SMALL_SPEC.rotation[1])
+
+    def test_mild_degradation_is_decodable(self):
+        """Une rotation et un léger bruit n'empêchent pas le décodage."""
+        spec = DegradationSpec(canvas_size=(400, 400), scale=(1.0, 1.0), perspective=(0, 0), gain=(1, 1),
+                               color_shift=(0, 0), blur_sigma=(0, 0), noise_std=(5, 5), occlusion=(0, 0),
+                               jpeg_quality=(95, 95))
+        image, _ = degrade(HexagonalEncoder(hex_size=6.0).encode("robuste"), item_rng(3, 0), spec)
+        self.assertEqual(HexagonalDecoder().decode(Image.fromarray(image)), "robuste")
+
+
+class TestGenerateCorpus(unittest.TestCase):
+
+    def generate(self, directory, workers):
+        return generate_corpus(directory, count=6, seed=5, spec=SMALL_SPEC, shard_size=4, workers=workers, hex_size=3.0)
+
+    def test_shards_and_determinism(self):
+        """Les fragments ne dépendent que de la graine, pas du nombre de workers."""
+        with tempfile.TemporaryDirectory() as serial, tempfile.TemporaryDirectory() as parallel:
+            report = self.generate(serial, workers=1)
+            self.generate(parallel, workers=2)
+            self.assertEqual((report.images, report.shards), (6, 2))
+            self.assertGreater(report.images_per_second, 0)
+            for name in ("shard-00000", "shard-00001"):
+                for suffix in (".npy", ".hxgc", ".json"):
+                    with self.subTest(file=name + suffix):
+                        self.assertEqual((Path(serial) / (name + suffix)).read_bytes(),
+                                         (Path(parallel) / (name + suffix)).read_bytes())
+
+            # Les images sont écrites au fil de l'eau dans un fichier partiel, renommé une fois complet
+            self.assertFalse(list(Path(serial).glob("*.part")))
+            images = np.load(Path(serial) / "shard-00001.npy")
+            records = json.loads((Path(serial) / "shard-00001.json").read_text(encoding="utf-8"))
+            self.assertEqual(images.shape, (2, 240, 240, 3))
+            self.assertEqual([r["index"] for r in records], [4, 5])
+            with GridCorpus(Path(serial) / "shard-00001.hxgc") as grids:
+                expected = GridState.from_cells("1", HexagonalEncoder().encode_cells(records[0]["message"]))
+                self.assertEqual(grids[0], expected)
+
+    def test_interrupted_shard(self):
+        """Un fragment interrompu par une erreur ne laisse aucun fichier, ni définitif ni partiel."""
+        with tempfile.TemporaryDirectory() as directory:
+            # Échelle nulle : la dégradation échoue dès la première image
+            spec = DegradationSpec(canvas_size=(240, 240), scale=(0.0, 0.0))
+            with self.assertRaises(np.linalg.LinAlgError):
+                generate_corpus(directory, count=2, seed=5, spec=spec, workers=1, hex_size=3.0)
+            self.assertEqual(list(Path(directory).iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
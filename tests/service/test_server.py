@@ -0,0 +1,107 @@
+import asyncio
+import struct
+from io import BytesIO
+import unittest
+import zlib
+from src.core.encoder import HexagonalEncoder
+from src.service.server import DecodeService, ServiceBusy
+from src.service.client import post_image, fetch_metrics
+
+
+def png_header(width, height):
+    """Un PNG réduit à son en-tête, déclarant une taille arbitraire."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"")) + chunk(b"IEND", b"")
+
+
+class TestDecodeService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = DecodeService(workers=1, max_pending=4, timeout=10.0)
+        await self.service.start("127.0.0.1", 0)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def post(self, image):
+        return await asyncio.to_thread(post_image, "127.0.0.1", self.service.port, image)
+
+    async def test_decode_end_to_end(self):
+        """Une image envoyée par le client local est décodée par le service."""
+        image = HexagonalEncoder(hex_size=5.0).encode("Borne 42")
+        status, payload = await self.post(image)
+        self.assertEqual(status, 200)
+        self.assertEqual(payload, {"text": "Borne 42"})
+
+    async def test_invalid_image(self):
+        """Des octets qui ne sont pas une image donnent une erreur 422."""
+        status, payload = await self.post(b"not an image")
+        self.assertEqual(status, 422)
+        self.assertIn("Image illisible", payload["error"])
+
+    async def test_oversized_images(self):
+        """Les images trop grandes sont refusées avant décompression, avec une réponse et un statut compté."""
+        for width, height in ((8000, 8000), (20000, 20000)):
+            status, payload = await self.post(png_header(width, height))
+            self.assertEqual(status, 422)
+            self.assertIn("Image trop grande", payload["error"])
+        metrics = await asyncio.to_thread(fetch_metrics, "127.0.0.1", self.service.port)
+        self.assertIn('decode_requests_total{status="error"} 2', metrics)
+
+    async def test_negative_content_length(self):
+        """Un Content-Length négatif donne une erreur 400, sans attendre de corps."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.service.port)
+        writer.write(b"POST /decode HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5.0)
+        writer.close()
+        self.assertTrue(response.startswith(b"HTTP/1.1 400"))
+
+    async def test_worker_crash(self):
+        """Un worker mort donne une erreur 503, puis le pool est remplacé."""
+        image = HexagonalEncoder(hex_size=5.0).encode("Relance")
+        self.assertEqual((await self.post(image))[0], 200)
+        for process in list(self.service._pool._processes.values()):
+            process.kill()
+            process.join()
+        status, _ = await self.post(image)
+        self.assertEqual(status, 503)
+        self.assertEqual(await self.post(image), (200, {"text": "Relance"}))
+        self.assertEqual(self.service._pending, 0)
+
+    async def test_running_job_counts_after_timeout(self):
+        """Un décodage démarré puis abandonné (délai dépassé) reste compté dans la file jusqu'à sa fin."""
+        buffer = BytesIO()
+        HexagonalEncoder(hex_size=60.0).encode("Lent").save(buffer, format="PNG")
+        self.service.timeout = 0.05
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.service.decode(buffer.getvalue())
+        self.assertEqual(self.service._pending, 1)
+        for _ in range(100):
+            if self.service._pending == 0:
+                break
+            await asyncio.sleep(0.05)
+        self.assertEqual(self.service._pending, 0)
+
+    async def test_metrics(self):
+        """Les compteurs Prometheus reflètent les requêtes traitées."""
+        await self.post(HexagonalEncoder(hex_size=5.0).encode("a"))
+        await self.post(b"???")
+        metrics = await asyncio.to_thread(fetch_metrics, "127.0.0.1", self.service.port)
+        self.assertIn('decode_requests_total{status="ok"} 1', metrics)
+        self.assertIn('decode_requests_total{status="error"} 1', metrics)
+        self.assertIn('decode_request_duration_seconds_count 2', metrics)
+        self.assertIn('decode_requests_in_flight 0', metrics)
+
+    async def test_bounded_queue(self):
+        """Au-delà de max_pending requêtes admises, le service refuse immédiatement."""
+        self.service._pending = self.service.max_pending
+        with self.assertRaises(ServiceBusy):
+            await self.service.decode(b"")
+        self.service._pending = 0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from src.utils.validators import OneOf, Validator # Assurez-vous que le chemin d'import est correct
+import numpy as np
+from src.utils.validators import OneOf, Validator, trusted # Assurez-vous que le chemin d'import est correct
 
 # Classe de test pour utiliser le descripteur OneOf
 class TestConfig:
@@ -57,6 +58,43 @@ class TestOneOfValidator(unittest.TestCase):
              # donc on utilise un regex plus flexible pour le message.
             validator.validate("d")
 
+    def test_validate_many_valid(self):
+        """validate_many accepte un tableau NumPy et un itérable de valeurs valides."""
+        validator = OneOf(0, 1, 2, 3)
+        validator.validate_many(np.array([[0, 1], [2, 3]]))
+        validator.validate_many([3, 2, 1])
+        validator.validate_many(np.array([], dtype=int))
+
+    def test_validate_many_invalid(self):
+        """validate_many lève le même message que validate pour la première valeur invalide."""
+        validator = OneOf(0, 1, 2, 3)
+        with self.assertRaisesRegex(ValueError, "^La valeur 5 n'est pas l'une des options valides : {0, 1, 2, 3}$"):
+            validator.validate_many(np.array([0, 5, 7]))
+        with self.assertRaisesRegex(ValueError, "La valeur 'd' n'est pas l'une des options valides"):
+            OneOf("a", "b").validate_many(["a", "d"])
+
+    def test_validate_many_no_conversion(self):
+        """validate_many ne convertit pas les valeurs : tuples et types distincts sont comparés tels quels."""
+        colors = OneOf((0, 0, 0), (255, 0, 0))
+        colors.validate_many([(0, 0, 0), (255, 0, 0)])
+        with self.assertRaisesRegex(ValueError, r"La valeur \(0, 255, 0\) n'est pas"):
+            colors.validate_many([(0, 255, 0)])
+        with self.assertRaisesRegex(ValueError, "La valeur '1' n'est pas"):
+            OneOf(1, 'a').validate_many(['1'])
+        with self.assertRaisesRegex(ValueError, "La valeur '1' n'est pas"):
+            OneOf(1, 'a').validate_many(np.array(['a', '1']))
+        OneOf(1, 'a').validate_many(np.array([1, 1]))
+
+    def test_trusted_construction(self):
+        """Dans un contexte trusted(), l'assignation ne valide pas les valeurs."""
+        with trusted():
+            config = TestConfig(orientation='angled', digit=9)
+        self.assertEqual(config.orientation, 'angled')
+        self.assertEqual(config.digit, 9)
+        # Hors du contexte, la validation est de nouveau active
+        with self.assertRaisesRegex(ValueError, "La valeur 5 n'est pas l'une des options valides"):
+            config.digit = 5
+
 
 if __name__ == '__main__':
     unittest.main()